@@ -1,15 +1,44 @@
-from flask import Flask, render_template_string, request, jsonify, session, redirect
+from flask import Flask, Response, request, jsonify, session, redirect
 from flask_cors import CORS
+import atexit
+import base64
+import bisect
+import click
+import csv
+import io
+import gzip
 import os
 import json
+import multiprocessing
+import queue
 import random
+import re
+import socket
+import sqlite3
 import string
+import sys
 import time
 import hashlib
+import ipaddress
+import threading
 import validators
-from datetime import datetime
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, urlunparse
 from typing import List, Dict, Any
 
+try:
+    import fcntl
+except ImportError:  # Windows: kod bloğu kiralama yalnızca süreç içi kilitle korunur
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:  # Opsiyonel: yoksa yalnızca gzip varyantı üretilir
+    brotli = None
+
 # Flask app oluştur
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -22,16 +51,295 @@ VISITS_DIR = os.path.join(DATA_DIR, 'visits')
 ADS_FILE = os.path.join(DATA_DIR, 'ads.json')
 ADMIN_FILE = os.path.join(DATA_DIR, 'admin.json')
 STATS_FILE = os.path.join(DATA_DIR, 'stats.json')
+STATS_SHARDS_DIR = os.path.join(DATA_DIR, 'stats')
+CATALOG_FILE = os.path.join(DATA_DIR, 'catalog.jsonl')
+URL_INDEX_DIR = os.path.join(DATA_DIR, 'urls')
+FUNNELS_DIR = os.path.join(DATA_DIR, 'funnels')
+FUNNELS_LOCK = os.path.join(DATA_DIR, 'funnels.lock')
+LINKS_LOCK = os.path.join(DATA_DIR, 'links.lock')
+CODE_COUNTER_FILE = os.path.join(DATA_DIR, 'code_counter.json')
+CODE_COUNTER_LOCK = os.path.join(DATA_DIR, 'code_counter.lock')
+# Eski ziyaret dosyalarının taşınması tamamlanınca oluşturulur; açılışta tarama tekrarlanmaz
+VISITS_MIGRATED_FILE = os.path.join(DATA_DIR, 'visits.migrated')
+
+# Storage backend seçimi: 'json' (varsayılan) veya 'sqlite'
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json').lower()
+SQLITE_PATH = os.environ.get('SQLITE_PATH', os.path.join(DATA_DIR, 'linkgec.db'))
+
+# Sayaç yazma tamponu ayarları
+COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL', 5))
+COUNTER_FLUSH_THRESHOLD = int(os.environ.get('COUNTER_FLUSH_THRESHOLD', 100))
+
+# Kısa kod üretici: her worker'a kiralanan sayaç bloğu boyutu
+CODE_BLOCK_SIZE = int(os.environ.get('CODE_BLOCK_SIZE', 1000))
+
+# Aynı URL tekrar kısaltılınca mevcut kod döndürülür (normalize URL -> kod indeksi)
+DEDUP_URLS = os.environ.get('DEDUP_URLS', '0').lower() in ('1', 'true', 'yes', 'on')
+VALIDATE_CACHE_SIZE = int(os.environ.get('VALIDATE_CACHE_SIZE', 4096))
+
+# Toplu kısaltma isteğindeki en fazla URL sayısı
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 1000))
+
+# Ziyaret kuyruğu: 0 ise ziyaretler istek içinde senkron yazılır
+VISIT_QUEUE_SIZE = int(os.environ.get('VISIT_QUEUE_SIZE', 10000))
+VISIT_QUEUE_POLICY = os.environ.get('VISIT_QUEUE_POLICY', 'block').lower()  # block | drop | sample
+VISIT_QUEUE_BLOCK_TIMEOUT = float(os.environ.get('VISIT_QUEUE_BLOCK_TIMEOUT', 1.0))
+VISIT_QUEUE_SAMPLE_RATE = float(os.environ.get('VISIT_QUEUE_SAMPLE_RATE', 0.1))
+VISIT_QUEUE_BATCH_SIZE = int(os.environ.get('VISIT_QUEUE_BATCH_SIZE', 500))
+
+# Rate limit kuralları: "adet/birim" virgülle ayrılır (birim: second, minute, hour, day); boş ise kapalı
+RATE_LIMIT_SHORTEN = os.environ.get('RATE_LIMIT_SHORTEN', '5/minute,10/hour')
+RATE_LIMIT_BATCH = os.environ.get('RATE_LIMIT_BATCH', '5/minute,10/hour')
+RATE_LIMIT_REDIRECT = os.environ.get('RATE_LIMIT_REDIRECT', '60/minute')
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower()  # memory | sqlite
+RATE_LIMIT_DB = os.environ.get('RATE_LIMIT_DB', os.path.join(DATA_DIR, 'ratelimit.db'))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))
+# X-Forwarded-For / X-Real-IP yalnızca bu adreslerden (IP veya CIDR, virgülle ayrılır) gelirse dikkate alınır
+TRUSTED_PROXIES = [ipaddress.ip_network(proxy.strip(), strict=False)
+                   for proxy in os.environ.get('TRUSTED_PROXIES', '').split(',') if proxy.strip()]
+
+# Ziyaret bölümleri: 'day' (visits/<kod>/<YYYY-MM-DD>.jsonl) veya 'month' (<YYYY-MM>.jsonl)
+VISIT_PARTITION = os.environ.get('VISIT_PARTITION', 'day').lower()
+VISIT_ARCHIVE_AFTER_DAYS = int(os.environ.get('VISIT_ARCHIVE_AFTER_DAYS', 30))  # 0: arşivleme kapalı
+VISIT_RETENTION_DAYS = int(os.environ.get('VISIT_RETENTION_DAYS', 0))  # 0: sınırsız saklama
+
+# links/ ve visits/ altında hash tabanlı alt klasör derinliği (links/ab/cd/<kod>.json); 0: düz yapı
+STORAGE_SHARD_DEPTH = int(os.environ.get('STORAGE_SHARD_DEPTH', 2))
+
+# Dışa aktarma: linkler Storage'dan bu boyuttaki sayfalarla okunur
+EXPORT_PAGE_SIZE = int(os.environ.get('EXPORT_PAGE_SIZE', 500))
 
 def ensure_dirs():
     os.makedirs(LINKS_DIR, exist_ok=True)
     os.makedirs(VISITS_DIR, exist_ok=True)
+    os.makedirs(STATS_SHARDS_DIR, exist_ok=True)
+    os.makedirs(URL_INDEX_DIR, exist_ok=True)
+    os.makedirs(FUNNELS_DIR, exist_ok=True)
     os.makedirs(DATA_DIR, exist_ok=True)
 
 ensure_dirs()
 
-# Storage sınıfı
-class Storage:
+# Önbellek ayarları
+LINK_CACHE_SIZE = int(os.environ.get('LINK_CACHE_SIZE', 1024))
+LINK_CACHE_TTL = float(os.environ.get('LINK_CACHE_TTL', 30))
+PAGE_CACHE_SIZE = int(os.environ.get('PAGE_CACHE_SIZE', 4096))
+
+# User-Agent sınıflandırıcı: desen dosyası yoksa yerleşik desenler kullanılır
+UA_PATTERNS_FILE = os.environ.get('UA_PATTERNS_FILE', os.path.join(DATA_DIR, 'ua_patterns.txt'))
+UA_PATTERNS_CHECK_INTERVAL = float(os.environ.get('UA_PATTERNS_CHECK_INTERVAL', 10))
+UA_CACHE_SIZE = int(os.environ.get('UA_CACHE_SIZE', 4096))
+
+# LRU + TTL önbellek
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+link_cache = LRUCache(LINK_CACHE_SIZE, LINK_CACHE_TTL)
+
+# Link kataloğu: oluşturulma sırasına göre dizili, yalnızca eklenen kayıt dosyası
+class LinkCatalog:
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._created = {}
+        self._keys = []
+        self._offset = 0
+        self._file_id = None
+        self._header = None
+        self._stat = None
+
+    def _apply(self, record: Dict):
+        short_code = record.get('short_code')
+        if record.get('op') == 'add':
+            if short_code in self._created:
+                return
+            key = (record.get('created_at', ''), short_code)
+            self._created[short_code] = key[0]
+            bisect.insort(self._keys, key)
+        elif record.get('op') == 'del':
+            created_at = self._created.pop(short_code, None)
+            if created_at is None:
+                return
+            index = bisect.bisect_left(self._keys, (created_at, short_code))
+            if index < len(self._keys) and self._keys[index] == (created_at, short_code):
+                del self._keys[index]
+
+    def _reset(self):
+        self._created = {}
+        self._keys = []
+        self._offset = 0
+        self._file_id = None
+        self._header = None
+        self._stat = None
+
+    def _build(self):
+        # Katalog yoksa links/ klasöründen bir kez oluşturulur
+        records = []
+        for _, filepath in JsonStorage._iter_link_files():
+            link_data = JsonStorage._read_json(filepath)
+            if link_data:
+                records.append({'op': 'add', 'short_code': link_data['short_code'],
+                                'created_at': link_data.get('created_at', '')})
+        records.sort(key=lambda r: (r['created_at'], r['short_code']))
+        # İlk satır nesil kaydıdır; yeniden oluşturulan dosya aynı inode'u alsa da ayırt edilir
+        records.insert(0, {'op': 'gen', 'id': os.urandom(8).hex()})
+        tmp_path = f'{self.filepath}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.filepath)
+
+    def _refresh(self):
+        # Diğer worker'ların eklediği satırlar dosyanın sonundan okunur
+        if not os.path.exists(self.filepath):
+            self._build()
+            self._reset()
+        stat = os.stat(self.filepath)
+        current = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if current == self._stat:
+            return
+        with open(self.filepath, 'rb') as f:
+            # rebuild-catalog dosyayı os.replace ile değiştirir; inode veya nesil satırı
+            # değiştiyse yeni dosya baştan okunur
+            header = f.readline()
+            file_id = current[:2]
+            if file_id != self._file_id or header != self._header or stat.st_size < self._offset:
+                self._reset()
+                self._file_id = file_id
+                self._header = header
+            f.seek(self._offset)
+            chunk = f.read(stat.st_size - self._offset)
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except ValueError:
+                continue
+        self._offset += end
+        self._stat = current
+
+    def _append(self, record: Dict):
+        with open(self.filepath, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def add(self, short_code: str, created_at: str):
+        self.add_many([(short_code, created_at)])
+
+    def add_many(self, entries: List[tuple]):
+        # Toplu eklemede tüm satırlar tek yazma işlemiyle eklenir
+        with self._lock:
+            self._refresh()
+            lines = [
+                json.dumps({'op': 'add', 'short_code': short_code, 'created_at': created_at}, ensure_ascii=False) + '\n'
+                for short_code, created_at in entries
+                if short_code not in self._created
+            ]
+            if not lines:
+                return
+            with open(self.filepath, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+            self._refresh()
+
+    def remove(self, short_code: str):
+        self.remove_many([short_code])
+
+    def remove_many(self, short_codes: List[str]):
+        with self._lock:
+            self._refresh()
+            lines = [
+                json.dumps({'op': 'del', 'short_code': short_code}, ensure_ascii=False) + '\n'
+                for short_code in short_codes
+                if short_code in self._created
+            ]
+            if not lines:
+                return
+            with open(self.filepath, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+            self._refresh()
+
+    def page(self, limit: int | None = None, cursor: tuple | None = None) -> tuple:
+        # En yeniden eskiye; cursor son döndürülen (created_at, short_code) çiftidir
+        with self._lock:
+            self._refresh()
+            end = bisect.bisect_left(self._keys, tuple(cursor)) if cursor else len(self._keys)
+            start = 0 if limit is None else max(end - limit, 0)
+            keys = self._keys[start:end][::-1]
+        next_cursor = keys[-1] if keys and start > 0 else None
+        return [short_code for _, short_code in keys], next_cursor
+
+    def rebuild(self) -> int:
+        with self._lock:
+            self._build()
+            self._reset()
+            self._refresh()
+            return len(self._keys)
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._keys)
+
+link_catalog = LinkCatalog(CATALOG_FILE)
+
+# JSON dosya tabanlı storage
+class JsonStorage:
+    _shard_lock = threading.Lock()
+    _shard_pid = None
+    _shard_totals = {}
     @staticmethod
     def _read_json(filepath: str, default_value: Any = None) -> Any:
         if not os.path.exists(filepath):
@@ -47,158 +355,1846 @@ class Storage:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
 
+    @staticmethod
+    def _shard_dir(base_dir: str, short_code: str) -> str:
+        # Kodun MD5 özetinin ilk baytları alt klasörleri belirler: <base>/ab/cd
+        digest = hashlib.md5(short_code.encode('utf-8')).hexdigest()
+        return os.path.join(base_dir, *(digest[i * 2:i * 2 + 2] for i in range(STORAGE_SHARD_DEPTH)))
+
+    @staticmethod
+    def _shard_path(base_dir: str, key: str) -> str:
+        # Okuma yolu: taşınmamış (düz yapıdaki) dosya varsa o kullanılır
+        filepath = os.path.join(JsonStorage._shard_dir(base_dir, key), f'{key}.json')
+        if STORAGE_SHARD_DEPTH and not os.path.exists(filepath):
+            flat_path = os.path.join(base_dir, f'{key}.json')
+            if os.path.exists(flat_path):
+                return flat_path
+        return filepath
+
+    @staticmethod
+    def _new_shard_path(base_dir: str, key: str) -> str:
+        # Yazma yolu: yeni ve güncellenen kayıtlar her zaman alt klasöre yazılır
+        shard_dir = JsonStorage._shard_dir(base_dir, key)
+        os.makedirs(shard_dir, exist_ok=True)
+        return os.path.join(shard_dir, f'{key}.json')
+
+    @staticmethod
+    def _shard_paths(base_dir: str, key: str) -> set:
+        # Taşıma sürerken kayıt iki yerde bulunabilir; silmede ikisi de kullanılır
+        return {os.path.join(JsonStorage._shard_dir(base_dir, key), f'{key}.json'),
+                os.path.join(base_dir, f'{key}.json')}
+
+    @staticmethod
+    def _link_path(short_code: str) -> str:
+        return JsonStorage._shard_path(LINKS_DIR, short_code)
+
+    @staticmethod
+    def _new_link_path(short_code: str) -> str:
+        return JsonStorage._new_shard_path(LINKS_DIR, short_code)
+
+    @staticmethod
+    def _sharded_visits_dir(link_code: str) -> str:
+        return os.path.join(JsonStorage._shard_dir(VISITS_DIR, link_code), link_code)
+
+    @staticmethod
+    def _visit_dirs(link_code: str) -> List[str]:
+        # Bir linkin mevcut ziyaret klasörleri; taşıma sürerken düz yapıdaki klasör önce gelir
+        link_visits_dir = JsonStorage._sharded_visits_dir(link_code)
+        flat_dir = os.path.join(VISITS_DIR, link_code)
+        candidates = [flat_dir, link_visits_dir] if STORAGE_SHARD_DEPTH else [link_visits_dir]
+        return [path for path in candidates if os.path.isdir(path)]
+
+    @staticmethod
+    def _visits_dir(link_code: str) -> str:
+        # Yazma yolu: taşınmamış bir klasör varsa eklemeler oraya yapılır, klasör bütün olarak taşınır
+        if STORAGE_SHARD_DEPTH:
+            flat_dir = os.path.join(VISITS_DIR, link_code)
+            if os.path.isdir(flat_dir):
+                return flat_dir
+        link_visits_dir = JsonStorage._sharded_visits_dir(link_code)
+        os.makedirs(link_visits_dir, exist_ok=True)
+        return link_visits_dir
+
+    @staticmethod
+    def _iter_shard_entries(base_dir: str, path: str | None = None, depth: int = 0):
+        # (ad, yol) üretir; kökte kalan düz yapı kayıtları da döner (alt klasör adları 2 karakterdir)
+        try:
+            entries = os.scandir(path or base_dir)
+        except FileNotFoundError:
+            return
+        with entries:
+            for entry in entries:
+                if depth == STORAGE_SHARD_DEPTH:
+                    yield entry.name, entry.path
+                elif entry.is_dir() and len(entry.name) == 2:
+                    yield from JsonStorage._iter_shard_entries(base_dir, entry.path, depth + 1)
+                elif depth == 0:
+                    yield entry.name, entry.path
+
+    @staticmethod
+    def _iter_link_files():
+        # (kod, dosya yolu); taşıma sırasında iki yerde bulunan link bir kez döner
+        for name, path in JsonStorage._iter_shard_entries(LINKS_DIR):
+            if not name.endswith('.json'):
+                continue
+            short_code = name[:-len('.json')]
+            if os.path.dirname(path) == LINKS_DIR and STORAGE_SHARD_DEPTH:
+                if os.path.exists(os.path.join(JsonStorage._shard_dir(LINKS_DIR, short_code), name)):
+                    continue
+            yield short_code, path
+
+    @staticmethod
+    def _iter_visit_codes():
+        # Ziyaret klasörü olan link kodları (her kod bir kez)
+        for name, path in JsonStorage._iter_shard_entries(VISITS_DIR):
+            if not os.path.isdir(path):
+                continue
+            if os.path.dirname(path) == VISITS_DIR and STORAGE_SHARD_DEPTH:
+                if os.path.isdir(JsonStorage._sharded_visits_dir(name)):
+                    continue
+            yield name
+
     @staticmethod
     def get_links() -> List[Dict]:
+        links, _ = JsonStorage.get_links_page()
+        return links
+
+    @staticmethod
+    def get_links_page(limit: int | None = None, cursor: tuple | None = None) -> tuple:
+        short_codes, next_cursor = link_catalog.page(limit, cursor)
         links = []
-        if os.path.exists(LINKS_DIR):
-            for filename in os.listdir(LINKS_DIR):
-                if filename.endswith('.json'):
-                    link_data = Storage._read_json(os.path.join(LINKS_DIR, filename))
-                    if link_data:
-                        links.append(link_data)
-        return sorted(links, key=lambda x: x.get('created_at', ''), reverse=True)
+        for short_code in short_codes:
+            link_data = JsonStorage.get_link(short_code)
+            if link_data:
+                links.append(link_data)
+        return links, next_cursor
 
     @staticmethod
     def get_link(short_code: str) -> Dict | None:
-        filepath = os.path.join(LINKS_DIR, f'{short_code}.json')
-        return Storage._read_json(filepath)
+        cached = link_cache.get(short_code)
+        if cached is not None:
+            return dict(cached)
+        link_data = JsonStorage.load_link(short_code)
+        if link_data:
+            link_cache.set(short_code, dict(link_data))
+        return link_data
+
+    @staticmethod
+    def load_link(short_code: str) -> Dict | None:
+        # Önbelleği atlayarak okur
+        return JsonStorage._read_json(JsonStorage._link_path(short_code))
+
+    @staticmethod
+    def iter_link_codes():
+        # Katalogdan bağımsız olarak links/ klasörü taranır
+        for short_code, _ in JsonStorage._iter_link_files():
+            yield short_code
 
     @staticmethod
     def save_link(link_data: Dict):
-        filepath = os.path.join(LINKS_DIR, f'{link_data["short_code"]}.json')
-        Storage._write_json(filepath, link_data)
+        # Atomik yazılır; eşzamanlı okuyucular yarım dosya görmez
+        with JsonStorage._file_lock(LINKS_LOCK):
+            JsonStorage._write_json_atomic(JsonStorage._new_link_path(link_data['short_code']), link_data, indent=4)
+        link_cache.invalidate(link_data['short_code'])
+        link_catalog.add(link_data['short_code'], link_data.get('created_at', ''))
+        JsonStorage._sync_url_index([link_data])
+
+    @staticmethod
+    def _url_index_key(normalized_url: str) -> str:
+        return hashlib.sha256(normalized_url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def find_code_by_url(url: str) -> str | None:
+        normalized_url = normalize_url(url)
+        entry = JsonStorage._read_json(
+            JsonStorage._shard_path(URL_INDEX_DIR, JsonStorage._url_index_key(normalized_url))
+        )
+        if entry and entry.get('url') == normalized_url:
+            return entry.get('short_code')
+        return None
+
+    @staticmethod
+    def _sync_url_index(links_data: List[Dict]):
+        # Aktif linkler indekse yazılır; pasifleşen link indeksteyse çıkarılır
+        if not DEDUP_URLS:
+            return
+        for link_data in links_data:
+            normalized_url = normalize_url(link_data['original_url'])
+            if link_data.get('is_active', True):
+                filepath = JsonStorage._new_shard_path(URL_INDEX_DIR, JsonStorage._url_index_key(normalized_url))
+                JsonStorage._write_json_atomic(filepath, {'url': normalized_url, 'short_code': link_data['short_code']})
+            else:
+                JsonStorage._unindex_url(normalized_url, link_data['short_code'])
+
+    @staticmethod
+    def _unindex_url(normalized_url: str, short_code: str):
+        # İndeks başka bir koda geçmişse dokunulmaz
+        for filepath in JsonStorage._shard_paths(URL_INDEX_DIR, JsonStorage._url_index_key(normalized_url)):
+            entry = JsonStorage._read_json(filepath)
+            if entry and entry.get('short_code') == short_code:
+                try:
+                    os.remove(filepath)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def create_link(link_data: Dict) -> bool:
+        return JsonStorage.create_links([link_data])[0]
+
+    @staticmethod
+    def create_links(links_data: List[Dict]) -> List[bool]:
+        # Kod zaten varsa dosyaya dokunmadan False döner (atomik oluşturma)
+        created = []
+        for link_data in links_data:
+            filepath = JsonStorage._new_link_path(link_data['short_code'])
+            # Taşınmamış aynı kodlu kayıt da çakışma sayılır
+            if STORAGE_SHARD_DEPTH and os.path.exists(os.path.join(LINKS_DIR, f'{link_data["short_code"]}.json')):
+                created.append(False)
+                continue
+            # Geçici dosya sabit bağlantıyla yerine konur: var olan dosyanın üzerine yazılmaz,
+            # okuyucular yarım yazılmış dosya görmez
+            tmp_path = f'{filepath}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(link_data, f, indent=4, ensure_ascii=False)
+            try:
+                os.link(tmp_path, filepath)
+            except FileExistsError:
+                created.append(False)
+                continue
+            finally:
+                os.remove(tmp_path)
+            link_cache.invalidate(link_data['short_code'])
+            created.append(True)
+        link_catalog.add_many([
+            (link_data['short_code'], link_data.get('created_at', ''))
+            for link_data, ok in zip(links_data, created) if ok
+        ])
+        JsonStorage._sync_url_index([link_data for link_data, ok in zip(links_data, created) if ok])
+        return created
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(lock_path: str):
+        # Süreçler arası dosya kilidi (fcntl yoksa kilitsiz)
+        with open(lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def lease_code_block(size: int) -> tuple:
+        # Sayaç dosyası süreçler arası dosya kilidiyle korunur
+        with JsonStorage._file_lock(CODE_COUNTER_LOCK):
+            state = JsonStorage._read_json(CODE_COUNTER_FILE) or {}
+            if 'key' not in state:
+                state = {'next': 0, 'key': os.urandom(16).hex()}
+            start = state['next']
+            state['next'] = start + size
+            JsonStorage._write_json_atomic(CODE_COUNTER_FILE, state)
+        return start, bytes.fromhex(state['key'])
+
+    @staticmethod
+    def save_links(links_data: List[Dict]):
+        with JsonStorage._file_lock(LINKS_LOCK):
+            for link_data in links_data:
+                JsonStorage._write_json_atomic(JsonStorage._new_link_path(link_data['short_code']), link_data,
+                                               indent=4)
+        for link_data in links_data:
+            link_cache.invalidate(link_data['short_code'])
+        link_catalog.add_many([
+            (link_data['short_code'], link_data.get('created_at', '')) for link_data in links_data
+        ])
+        JsonStorage._sync_url_index(links_data)
+
+    @staticmethod
+    def set_links_active(short_codes: List[str], is_active: bool) -> List[str]:
+        # Yalnızca is_active değişir; sayaç alanları diskteki güncel değerleriyle kalır.
+        # Diskteki durumu gerçekten değişen kodlar döner
+        updated = []
+        with JsonStorage._file_lock(LINKS_LOCK):
+            for short_code in short_codes:
+                link_data = JsonStorage.load_link(short_code)
+                if not link_data or bool(link_data.get('is_active', True)) == is_active:
+                    continue
+                link_data['is_active'] = is_active
+                JsonStorage._write_json_atomic(JsonStorage._new_link_path(short_code), link_data, indent=4)
+                link_cache.invalidate(short_code)
+                updated.append(link_data)
+        JsonStorage._sync_url_index(updated)
+        return [link_data['short_code'] for link_data in updated]
+
+    @staticmethod
+    def delete_link(short_code: str) -> Dict | None:
+        deleted = JsonStorage.delete_links([short_code])
+        return deleted[0] if deleted else None
+
+    @staticmethod
+    def delete_links(short_codes: List[str]) -> List[Dict]:
+        # Diskte bulunup silinen kayıtlar döner; başka worker'ın sildiği link sayılmaz
+        deleted = []
+        link_catalog.remove_many(short_codes)
+        for short_code in short_codes:
+            link_cache.invalidate(short_code)
+            with JsonStorage._file_lock(LINKS_LOCK):
+                link_data = JsonStorage.load_link(short_code)
+                for filepath in JsonStorage._shard_paths(LINKS_DIR, short_code):
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+            if link_data:
+                deleted.append(link_data)
+                if DEDUP_URLS:
+                    JsonStorage._unindex_url(normalize_url(link_data['original_url']), short_code)
+            for visit_dir in JsonStorage._visit_dirs(short_code):
+                import shutil
+                shutil.rmtree(visit_dir)
+            with JsonStorage._file_lock(FUNNELS_LOCK):
+                for funnel_path in JsonStorage._shard_paths(FUNNELS_DIR, short_code):
+                    if os.path.exists(funnel_path):
+                        os.remove(funnel_path)
+        return deleted
+
+    @staticmethod
+    def _read_jsonl(filepath: str) -> List[Dict]:
+        records = []
+        if not os.path.exists(filepath):
+            return records
+        opener = gzip.open if filepath.endswith('.gz') else open
+        with opener(filepath, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Yarım kalmış satır (çökme sırasında yazılmış olabilir)
+                    continue
+        return records
 
     @staticmethod
-    def delete_link(short_code: str):
-        filepath = os.path.join(LINKS_DIR, f'{short_code}.json')
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        visit_dir = os.path.join(VISITS_DIR, short_code)
-        if os.path.exists(visit_dir):
-            import shutil
-            shutil.rmtree(visit_dir)
+    def _append_jsonl(filepath: str, records: List[Dict]):
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        with open(filepath, 'a', encoding='utf-8') as f:
+            f.write(lines)
 
     @staticmethod
-    def get_visits(link_code: str) -> List[Dict]:
-        filepath = os.path.join(VISITS_DIR, link_code, 'visits.json')
-        return Storage._read_json(filepath, [])
+    def _partition_key(visit_time: str) -> str:
+        return visit_time[:7] if VISIT_PARTITION == 'month' else visit_time[:10]
+
+    @staticmethod
+    def _visit_partitions(link_code: str, start: str | None = None, end: str | None = None,
+                          archived: bool | None = None) -> List[tuple]:
+        # (anahtar, dosya yolu, arşiv mi) listesi, eskiden yeniye; bölüm anahtarı zaman önekidir.
+        # Aynı bölümün hem .jsonl hem .jsonl.gz hali varsa (yarım kalmış arşivleme) arşiv okunur.
+        # Taşıma sırasında iki klasörde de bulunan bölümün alt klasördeki hali okunur.
+        partitions = {}
+        for link_visits_dir in JsonStorage._visit_dirs(link_code):
+            dir_partitions = {}
+            for filename in os.listdir(link_visits_dir):
+                if filename.endswith('.jsonl.gz'):
+                    key, is_archive = filename[:-len('.jsonl.gz')], True
+                elif filename.endswith('.jsonl'):
+                    key, is_archive = filename[:-len('.jsonl')], False
+                else:
+                    continue
+                if key == 'visits':
+                    key = ''  # Bölümlenmemiş eski kayıt dosyası
+                if key in dir_partitions and dir_partitions[key][1]:
+                    continue
+                dir_partitions[key] = (os.path.join(link_visits_dir, filename), is_archive)
+            partitions.update(dir_partitions)
+        selected = []
+        for key in sorted(partitions):
+            filepath, is_archive = partitions[key]
+            if archived is not None and is_archive != archived:
+                continue
+            if key and start and key < start[:len(key)]:
+                continue
+            if key and end and key > end[:len(key)]:
+                continue
+            selected.append((key, filepath, is_archive))
+        return selected
+
+    @staticmethod
+    def _filter_visits(visits: List[Dict], start: str | None, end: str | None) -> List[Dict]:
+        if start is None and end is None:
+            return visits
+        return [visit for visit in visits
+                if (start is None or visit.get('visit_time', '') >= start)
+                and (end is None or visit.get('visit_time', '') < end)]
+
+    @staticmethod
+    def get_visits(link_code: str, start: str | None = None, end: str | None = None) -> List[Dict]:
+        # start dahil, end hariç ISO zaman aralığı; yalnızca aralığa düşen bölümler okunur
+        visits = []
+        for _, filepath, _ in JsonStorage._visit_partitions(link_code, start, end):
+            visits.extend(JsonStorage._read_jsonl(filepath))
+        return JsonStorage._filter_visits(visits, start, end)
+
+    @staticmethod
+    def iter_visits(link_code: str, start: str | None = None, end: str | None = None,
+                    position: tuple | None = None):
+        # (konum, ziyaret) üretir; bellekte tek satır tutulur. Konum [bölüm, bayt ofseti] olup
+        # sonraki çağrıda verilirse kaldığı yerden devam edilir
+        partitions = JsonStorage._visit_partitions(link_code, start, end)
+        yield from JsonStorage._iter_partitions(partitions, start, end, position)
+
+    @staticmethod
+    def valid_visit_position(position: tuple) -> bool:
+        # iter_visits'e verilecek konum: [bölüm anahtarı, bayt ofseti]
+        return (len(position) == 2 and isinstance(position[0], str)
+                and type(position[1]) is int and position[1] >= 0)
+
+    @staticmethod
+    def _iter_partitions(partitions: List[tuple], start: str | None, end: str | None,
+                         position: tuple | None = None):
+        for key, filepath, is_archive in partitions:
+            offset = 0
+            if position:
+                if key < position[0]:
+                    continue
+                if key == position[0]:
+                    offset = position[1]
+            # Arşiv düz dosyayla aynı satır biçimiyle yazılır; ofsetler arşivlemeden sonra da geçerlidir
+            opener = gzip.open if is_archive else open
+            with opener(filepath, 'rb') as f:
+                if offset:
+                    f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Henüz yazılmakta olan son satır
+                    offset += len(line)
+                    try:
+                        visit = json.loads(line)
+                    except ValueError:
+                        continue
+                    visit_time = visit.get('visit_time', '')
+                    if (start is not None and visit_time < start) or (end is not None and visit_time >= end):
+                        continue
+                    yield (key, offset), visit
 
     @staticmethod
     def save_visit(link_code: str, visit_data: Dict):
-        link_visits_dir = os.path.join(VISITS_DIR, link_code)
-        os.makedirs(link_visits_dir, exist_ok=True)
-        filepath = os.path.join(link_visits_dir, 'visits.json')
-        visits = Storage._read_json(filepath, [])
-        visits.append(visit_data)
-        Storage._write_json(filepath, visits)
+        JsonStorage.save_visits(link_code, [visit_data])
+
+    @staticmethod
+    def save_visits(link_code: str, visits: List[Dict]):
+        link_visits_dir = JsonStorage._visits_dir(link_code)
+        partitions = {}
+        for visit in visits:
+            partitions.setdefault(JsonStorage._partition_key(visit['visit_time']), []).append(visit)
+        for key, records in partitions.items():
+            try:
+                JsonStorage._append_jsonl(os.path.join(link_visits_dir, f'{key}.jsonl'), records)
+            except FileNotFoundError:
+                # Klasör bu arada shard-storage ile alt klasöre taşındı
+                link_visits_dir = JsonStorage._visits_dir(link_code)
+                JsonStorage._append_jsonl(os.path.join(link_visits_dir, f'{key}.jsonl'), records)
+
+    @staticmethod
+    def _merge_jsonl(filepath: str, records: List[Dict]):
+        # Mevcut kayıtlarla birleştirip atomik yazar; aynı kayıt iki kez yazılmaz (yeniden çalıştırılabilir)
+        lines = [json.dumps(record, ensure_ascii=False) for record in JsonStorage._read_jsonl(filepath) + records]
+        content = ''.join(line + '\n' for line in dict.fromkeys(lines))
+        tmp_path = filepath + '.tmp'
+        if filepath.endswith('.gz'):
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(content)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        os.replace(tmp_path, filepath)
+
+    @staticmethod
+    def migrate_visits(force: bool = False) -> int:
+        # Eski visits.json dizilerini ve bölümlenmemiş visits.jsonl dosyalarını günlük/aylık bölümlere taşır.
+        # Tamamlandıktan sonra yalnızca force ile (migrate-visits komutu) tekrar taranır
+        if not force and os.path.exists(VISITS_MIGRATED_FILE):
+            return 0
+        migrated = 0
+        for _, link_visits_dir in JsonStorage._iter_shard_entries(VISITS_DIR):
+            legacy_path = os.path.join(link_visits_dir, 'visits.json')
+            log_path = os.path.join(link_visits_dir, 'visits.jsonl')
+            if not os.path.isfile(legacy_path) and not os.path.isfile(log_path):
+                continue
+            visits = JsonStorage._read_json(legacy_path, []) + JsonStorage._read_jsonl(log_path)
+            partitions = {}
+            for visit in visits:
+                key = JsonStorage._partition_key(visit.get('visit_time') or '0000-00-00')
+                partitions.setdefault(key, []).append(visit)
+            for key, records in partitions.items():
+                JsonStorage._merge_jsonl(os.path.join(link_visits_dir, f'{key}.jsonl'), records)
+            for path in (legacy_path, log_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            migrated += 1
+        with open(VISITS_MIGRATED_FILE, 'w', encoding='utf-8') as f:
+            f.write(datetime.now().isoformat() + '\n')
+        return migrated
+
+    @staticmethod
+    def _shard_flat_files(base_dir: str) -> int:
+        moved = 0
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                # Sabit bağlantı hedefin üzerine yazmaz; bu arada alt klasöre yazılmış yeni kayıt korunur
+                try:
+                    os.link(entry.path, JsonStorage._new_shard_path(base_dir, entry.name[:-len('.json')]))
+                except FileExistsError:
+                    pass
+                os.remove(entry.path)
+                moved += 1
+        return moved
+
+    @staticmethod
+    def shard_storage() -> Dict:
+        # Düz yapıdaki links/, urls/, funnels/ dosyalarını ve visits/<kod>/ klasörlerini alt klasörlere taşır.
+        # Uygulama çalışırken çalıştırılabilir; yarıda kalırsa tekrar çalıştırılır.
+        result = {'links': 0, 'urls': 0, 'funnels': 0, 'visits': 0}
+        if not STORAGE_SHARD_DEPTH:
+            return result
+        result['links'] = JsonStorage._shard_flat_files(LINKS_DIR)
+        result['urls'] = JsonStorage._shard_flat_files(URL_INDEX_DIR)
+        # Huni sayaçları kilit altında güncellenir; taşıma da aynı kilidi tutar
+        with JsonStorage._file_lock(FUNNELS_LOCK):
+            result['funnels'] = JsonStorage._shard_flat_files(FUNNELS_DIR)
+        with os.scandir(VISITS_DIR) as entries:
+            for entry in entries:
+                if len(entry.name) == 2 or not entry.is_dir():
+                    continue
+                target_dir = JsonStorage._sharded_visits_dir(entry.name)
+                os.makedirs(os.path.dirname(target_dir), exist_ok=True)
+                try:
+                    os.rename(entry.path, target_dir)
+                except OSError:
+                    # Hedef klasör taşıma sırasında oluşmuş: bölümler tek tek birleştirilir
+                    for filename in os.listdir(entry.path):
+                        source = os.path.join(entry.path, filename)
+                        target = os.path.join(target_dir, filename)
+                        if filename.endswith(('.jsonl', '.jsonl.gz')):
+                            JsonStorage._merge_jsonl(target, JsonStorage._read_jsonl(source))
+                            os.remove(source)
+                        elif not os.path.exists(target):
+                            os.replace(source, target)
+                        else:
+                            os.remove(source)
+                    os.rmdir(entry.path)
+                result['visits'] += 1
+        return result
+
+    @staticmethod
+    def _partition_cutoff(days: int, now: datetime | None = None) -> str | None:
+        # Bu anahtardan küçük bölümlerin tüm kayıtları 'days' günden eskidir
+        if days <= 0:
+            return None
+        cutoff = ((now or datetime.now()) - timedelta(days=days)).date().isoformat()
+        return JsonStorage._partition_key(cutoff)
+
+    @staticmethod
+    def archive_visits(archive_after_days: int = VISIT_ARCHIVE_AFTER_DAYS,
+                       retention_days: int = VISIT_RETENTION_DAYS) -> Dict:
+        # Eski bölümleri gzip arşive çevirir, saklama süresini aşanları siler
+        archive_cutoff = JsonStorage._partition_cutoff(archive_after_days)
+        retention_cutoff = JsonStorage._partition_cutoff(retention_days)
+        result = {'archived': 0, 'pruned': 0}
+        for link_code in JsonStorage._iter_visit_codes():
+            for key, filepath, is_archive in JsonStorage._visit_partitions(link_code):
+                if not key:
+                    continue
+                if retention_cutoff and key < retention_cutoff:
+                    JsonStorage._remove_partition(filepath)
+                    result['pruned'] += 1
+                elif archive_cutoff and key < archive_cutoff and not is_archive:
+                    JsonStorage._merge_jsonl(filepath + '.gz', JsonStorage._read_jsonl(filepath))
+                    os.remove(filepath)
+                    result['archived'] += 1
+        return result
+
+    @staticmethod
+    def _remove_partition(filepath: str):
+        # Arşiv ve (yarım kalmış arşivlemeden kalan) düz dosya birlikte silinir
+        base = filepath[:-len('.gz')] if filepath.endswith('.gz') else filepath
+        for path in (base, base + '.gz'):
+            if os.path.exists(path):
+                os.remove(path)
 
     @staticmethod
     def get_ads() -> List[Dict]:
-        return Storage._read_json(ADS_FILE, [])
+        return JsonStorage._read_json(ADS_FILE, [])
 
     @staticmethod
     def save_ads(ads_data: List[Dict]):
-        Storage._write_json(ADS_FILE, ads_data)
+        JsonStorage._write_json(ADS_FILE, ads_data)
 
     @staticmethod
     def get_admin_user() -> Dict | None:
-        return Storage._read_json(ADMIN_FILE)
+        return JsonStorage._read_json(ADMIN_FILE)
 
     @staticmethod
     def save_admin_user(admin_data: Dict):
-        Storage._write_json(ADMIN_FILE, admin_data)
+        JsonStorage._write_json(ADMIN_FILE, admin_data)
+
+    @staticmethod
+    def _write_json_atomic(filepath: str, data: Any, indent: int | None = None):
+        tmp_path = f'{filepath}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
+
+    @staticmethod
+    def _stats_shard_path() -> str:
+        # Her worker süreci yalnızca kendi shard dosyasına yazar; fork edilen worker'lar aynı
+        # WORKER_ID'yi devraldığından pid her zaman eklenir
+        worker_id = os.environ.get('WORKER_ID') or socket.gethostname()
+        return os.path.join(STATS_SHARDS_DIR, f'{worker_id}-{os.getpid()}.json')
+
+    @staticmethod
+    def get_stats() -> Dict:
+        stats = JsonStorage._read_json(STATS_FILE, {'total_links': 0, 'active_links': 0, 'total_clicks': 0, 'total_visits': 0})
+        if os.path.exists(STATS_SHARDS_DIR):
+            for filename in os.listdir(STATS_SHARDS_DIR):
+                if not filename.endswith('.json'):
+                    continue
+                shard = JsonStorage._read_json(os.path.join(STATS_SHARDS_DIR, filename), {})
+                for key, value in shard.items():
+                    stats[key] = stats.get(key, 0) + value
+        return stats
+
+    @staticmethod
+    def save_stats(stats_data: Dict):
+        JsonStorage._write_json(STATS_FILE, stats_data)
+
+    @staticmethod
+    def add_stats(deltas: Dict):
+        with JsonStorage._shard_lock:
+            # fork sonrası yeni süreç kendi shard'ını baştan açar
+            if JsonStorage._shard_pid != os.getpid():
+                JsonStorage._shard_pid = os.getpid()
+                JsonStorage._shard_totals = JsonStorage._read_json(JsonStorage._stats_shard_path(), {})
+            # Yeni toplamlar kopyada hesaplanır; yazma başarısız olursa bellekteki toplamlar değişmez
+            # (CounterBuffer farkları tekrar dener)
+            totals = dict(JsonStorage._shard_totals)
+            for key, delta in deltas.items():
+                totals[key] = totals.get(key, 0) + delta
+            JsonStorage._write_json_atomic(JsonStorage._stats_shard_path(), totals)
+            JsonStorage._shard_totals = totals
+
+    @staticmethod
+    def compact_stats() -> int:
+        # Shard'ları stats.json içine katlar; tüm worker'lar durdurulmuşken çalıştırılmalı
+        stats = JsonStorage.get_stats()
+        JsonStorage.save_stats(stats)
+        removed = 0
+        for filename in os.listdir(STATS_SHARDS_DIR):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(STATS_SHARDS_DIR, filename))
+                removed += 1
+        with JsonStorage._shard_lock:
+            JsonStorage._shard_pid = None
+            JsonStorage._shard_totals = {}
+        return removed
+
+    @staticmethod
+    def add_link_counts(short_code: str, deltas: Dict):
+        # Worker'ların aynı link için yaptığı oku-değiştir-yaz işlemleri kilitle sıralanır
+        with JsonStorage._file_lock(LINKS_LOCK):
+            link_data = JsonStorage.load_link(short_code)
+            if link_data:
+                for field, delta in deltas.items():
+                    link_data[field] = link_data.get(field, 0) + delta
+                JsonStorage._write_json_atomic(JsonStorage._new_link_path(short_code), link_data, indent=4)
+        link_cache.invalidate(short_code)
+
+    @staticmethod
+    def add_funnel_counts(deltas: Dict):
+        # deltas: {kod: {gün: {adım: adet}}}; her kod (ve FUNNEL_TOTAL) için funnels/<kod>.json
+        with JsonStorage._file_lock(FUNNELS_LOCK):
+            for short_code, days in deltas.items():
+                filepath = JsonStorage._shard_path(FUNNELS_DIR, short_code)
+                rollup = JsonStorage._read_json(filepath, {})
+                for day, steps in days.items():
+                    counts = rollup.setdefault(day, {})
+                    for step, delta in steps.items():
+                        counts[str(step)] = counts.get(str(step), 0) + delta
+                new_path = JsonStorage._new_shard_path(FUNNELS_DIR, short_code)
+                JsonStorage._write_json_atomic(new_path, rollup)
+                if filepath != new_path:
+                    os.remove(filepath)
+
+    @staticmethod
+    def get_funnel(short_code: str, start: str, end: str) -> Dict:
+        # {gün: {adım: adet}}, start ve end (YYYY-MM-DD) dahil
+        rollup = JsonStorage._read_json(JsonStorage._shard_path(FUNNELS_DIR, short_code), {})
+        return {day: {int(step): count for step, count in steps.items()}
+                for day, steps in rollup.items() if start <= day <= end}
+
+    @staticmethod
+    def count_visits(link_code: str) -> int:
+        return JsonStorage._count_partition_lines(JsonStorage._visit_partitions(link_code))
+
+    @staticmethod
+    def _count_partition_lines(partitions: List[tuple]) -> int:
+        count = 0
+        for _, filepath, is_archive in partitions:
+            opener = gzip.open if is_archive else open
+            with opener(filepath, 'rb') as f:
+                count += sum(1 for line in f if line.strip())
+        return count
+
+    @staticmethod
+    def rebuild_visit_counts() -> int:
+        updated = 0
+        for short_code in link_catalog.page()[0]:
+            # Okuma, sayım ve yazma add_link_counts ile aynı kilit altında; yalnızca visits_count değişir
+            with JsonStorage._file_lock(LINKS_LOCK):
+                link_data = JsonStorage.load_link(short_code)
+                if not link_data:
+                    continue
+                link_data['visits_count'] = JsonStorage.count_visits(short_code)
+                JsonStorage._write_json_atomic(JsonStorage._new_link_path(short_code), link_data, indent=4)
+            link_cache.invalidate(short_code)
+            updated += 1
+        return updated
+
+    @staticmethod
+    def rebuild_url_index() -> int:
+        # Eski kayıtlar silinir; aynı URL'ye sahip aktif linklerden en yenisi indekslenir
+        for _, filepath in JsonStorage._iter_shard_entries(URL_INDEX_DIR):
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+        indexed = {}
+        for link_data in reversed(JsonStorage.get_links()):
+            if link_data.get('is_active', True):
+                indexed[normalize_url(link_data['original_url'])] = link_data['short_code']
+        for normalized_url, short_code in indexed.items():
+            JsonStorage._write_json_atomic(
+                JsonStorage._new_shard_path(URL_INDEX_DIR, JsonStorage._url_index_key(normalized_url)),
+                {'url': normalized_url, 'short_code': short_code}
+            )
+        return len(indexed)
+
+# SQLite tabanlı storage (WAL modu)
+class SqliteStorage(JsonStorage):
+    _local = threading.local()
+    _schema_lock = threading.Lock()
+    _schema_ready = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS links (
+            short_code TEXT PRIMARY KEY,
+            original_url TEXT NOT NULL,
+            click_count INTEGER NOT NULL DEFAULT 0,
+            visits_count INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            is_active INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_links_created ON links (created_at, short_code);
+        CREATE TABLE IF NOT EXISTS visits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            link_code TEXT NOT NULL,
+            ip_address TEXT,
+            user_agent TEXT,
+            referrer TEXT,
+            step INTEGER,
+            visit_time TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_visits_link_time ON visits (link_code, visit_time);
+        CREATE TABLE IF NOT EXISTS stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS funnels (
+            link_code TEXT NOT NULL,
+            day TEXT NOT NULL,
+            step INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (link_code, day, step)
+        );
+        CREATE TABLE IF NOT EXISTS url_index (
+            url TEXT PRIMARY KEY,
+            short_code TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_url_index_code ON url_index (short_code);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    @staticmethod
+    def _conn() -> sqlite3.Connection:
+        conn = getattr(SqliteStorage._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(SQLITE_PATH, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with SqliteStorage._schema_lock:
+                if not SqliteStorage._schema_ready:
+                    conn.executescript(SqliteStorage.SCHEMA)
+                    SqliteStorage._migrate_schema(conn)
+                    SqliteStorage._schema_ready = True
+            SqliteStorage._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate_schema(conn: sqlite3.Connection):
+        # Eski veritabanlarına sonradan eklenen kolonlar
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(links)')}
+        if 'visits_count' not in columns:
+            with conn:
+                conn.execute('ALTER TABLE links ADD COLUMN visits_count INTEGER NOT NULL DEFAULT 0')
+
+    @staticmethod
+    def _link_from_row(row: sqlite3.Row) -> Dict:
+        return {
+            'short_code': row['short_code'],
+            'original_url': row['original_url'],
+            'click_count': row['click_count'],
+            'visits_count': row['visits_count'],
+            'created_at': row['created_at'],
+            'is_active': bool(row['is_active'])
+        }
+
+    @staticmethod
+    def _visit_from_row(row: sqlite3.Row) -> Dict:
+        return {
+            'link_code': row['link_code'],
+            'ip_address': row['ip_address'],
+            'user_agent': row['user_agent'],
+            'referrer': row['referrer'],
+            'step': row['step'],
+            'visit_time': row['visit_time']
+        }
+
+    @staticmethod
+    def get_links() -> List[Dict]:
+        rows = SqliteStorage._conn().execute(
+            'SELECT * FROM links ORDER BY created_at DESC'
+        ).fetchall()
+        return [SqliteStorage._link_from_row(row) for row in rows]
+
+    @staticmethod
+    def get_links_page(limit: int | None = None, cursor: tuple | None = None) -> tuple:
+        query = 'SELECT * FROM links'
+        params = []
+        if cursor:
+            query += ' WHERE (created_at, short_code) < (?, ?)'
+            params.extend(cursor)
+        query += ' ORDER BY created_at DESC, short_code DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit + 1)
+        rows = SqliteStorage._conn().execute(query, params).fetchall()
+        links = [SqliteStorage._link_from_row(row) for row in rows[:limit]]
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            next_cursor = (links[-1]['created_at'], links[-1]['short_code'])
+        return links, next_cursor
+
+    @staticmethod
+    def get_link(short_code: str) -> Dict | None:
+        cached = link_cache.get(short_code)
+        if cached is not None:
+            return dict(cached)
+        link_data = SqliteStorage.load_link(short_code)
+        if link_data:
+            link_cache.set(short_code, dict(link_data))
+        return link_data
+
+    @staticmethod
+    def load_link(short_code: str) -> Dict | None:
+        row = SqliteStorage._conn().execute(
+            'SELECT * FROM links WHERE short_code = ?', (short_code,)
+        ).fetchone()
+        if row is None:
+            return None
+        return SqliteStorage._link_from_row(row)
+
+    @staticmethod
+    def iter_link_codes():
+        cursor = SqliteStorage._conn().execute('SELECT short_code FROM links')
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield row['short_code']
+
+    @staticmethod
+    def save_link(link_data: Dict):
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO links (short_code, original_url, click_count, visits_count, created_at, is_active) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (link_data['short_code'], link_data['original_url'], link_data['click_count'],
+                 link_data.get('visits_count', 0), link_data['created_at'], int(link_data['is_active']))
+            )
+            SqliteStorage._sync_url_index(conn, [link_data])
+        link_cache.invalidate(link_data['short_code'])
+
+    @staticmethod
+    def find_code_by_url(url: str) -> str | None:
+        row = SqliteStorage._conn().execute(
+            'SELECT short_code FROM url_index WHERE url = ?', (normalize_url(url),)
+        ).fetchone()
+        return row['short_code'] if row else None
+
+    @staticmethod
+    def _sync_url_index(conn: sqlite3.Connection, links_data: List[Dict]):
+        if not DEDUP_URLS:
+            return
+        conn.executemany(
+            'INSERT OR REPLACE INTO url_index (url, short_code) VALUES (?, ?)',
+            [(normalize_url(link_data['original_url']), link_data['short_code'])
+             for link_data in links_data if link_data.get('is_active', True)]
+        )
+        conn.executemany(
+            'DELETE FROM url_index WHERE url = ? AND short_code = ?',
+            [(normalize_url(link_data['original_url']), link_data['short_code'])
+             for link_data in links_data if not link_data.get('is_active', True)]
+        )
+
+    @staticmethod
+    def create_link(link_data: Dict) -> bool:
+        return SqliteStorage.create_links([link_data])[0]
+
+    @staticmethod
+    def create_links(links_data: List[Dict]) -> List[bool]:
+        # Tek transaction; var olan kodlar atlanır ve False döner
+        conn = SqliteStorage._conn()
+        created = []
+        with conn:
+            for link_data in links_data:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO links (short_code, original_url, click_count, visits_count, created_at, is_active) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (link_data['short_code'], link_data['original_url'], link_data['click_count'],
+                     link_data.get('visits_count', 0), link_data['created_at'], int(link_data['is_active']))
+                )
+                created.append(cursor.rowcount == 1)
+            SqliteStorage._sync_url_index(conn, [link_data for link_data, ok in zip(links_data, created) if ok])
+        for link_data, ok in zip(links_data, created):
+            if ok:
+                link_cache.invalidate(link_data['short_code'])
+        return created
+
+    @staticmethod
+    def lease_code_block(size: int) -> tuple:
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = dict(conn.execute(
+                "SELECT key, value FROM meta WHERE key IN ('code_next', 'code_key')"
+            ).fetchall())
+            key = rows.get('code_key') or os.urandom(16).hex()
+            start = int(rows.get('code_next', 0))
+            conn.executemany(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                [('code_next', str(start + size)), ('code_key', key)]
+            )
+        return start, bytes.fromhex(key)
+
+    @staticmethod
+    def save_links(links_data: List[Dict]):
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO links (short_code, original_url, click_count, visits_count, created_at, is_active) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(link_data['short_code'], link_data['original_url'], link_data['click_count'],
+                  link_data.get('visits_count', 0), link_data['created_at'], int(link_data['is_active']))
+                 for link_data in links_data]
+            )
+            SqliteStorage._sync_url_index(conn, links_data)
+        for link_data in links_data:
+            link_cache.invalidate(link_data['short_code'])
+
+    @staticmethod
+    def set_links_active(short_codes: List[str], is_active: bool) -> List[str]:
+        conn = SqliteStorage._conn()
+        changed = []
+        with conn:
+            for short_code in short_codes:
+                cursor = conn.execute('UPDATE links SET is_active = ? WHERE short_code = ? AND is_active != ?',
+                                      (int(is_active), short_code, int(is_active)))
+                if cursor.rowcount:
+                    changed.append(short_code)
+            if DEDUP_URLS:
+                rows = [conn.execute('SELECT * FROM links WHERE short_code = ?', (short_code,)).fetchone()
+                        for short_code in changed]
+                SqliteStorage._sync_url_index(conn, [SqliteStorage._link_from_row(row) for row in rows if row])
+        for short_code in short_codes:
+            link_cache.invalidate(short_code)
+        return changed
+
+    @staticmethod
+    def delete_link(short_code: str) -> Dict | None:
+        deleted = SqliteStorage.delete_links([short_code])
+        return deleted[0] if deleted else None
+
+    @staticmethod
+    def delete_links(short_codes: List[str]) -> List[Dict]:
+        for short_code in short_codes:
+            link_cache.invalidate(short_code)
+        conn = SqliteStorage._conn()
+        deleted = []
+        with conn:
+            # Okuma ve silme aynı yazma kilidi altında; iki worker aynı linki iki kez silmiş saymaz
+            conn.execute('BEGIN IMMEDIATE')
+            for short_code in short_codes:
+                row = conn.execute('SELECT * FROM links WHERE short_code = ?', (short_code,)).fetchone()
+                if row:
+                    deleted.append(SqliteStorage._link_from_row(row))
+            conn.executemany('DELETE FROM links WHERE short_code = ?', [(c,) for c in short_codes])
+            conn.executemany('DELETE FROM visits WHERE link_code = ?', [(c,) for c in short_codes])
+            conn.executemany('DELETE FROM url_index WHERE short_code = ?', [(c,) for c in short_codes])
+            conn.executemany('DELETE FROM funnels WHERE link_code = ?', [(c,) for c in short_codes])
+        for short_code in short_codes:
+            for archive_dir in JsonStorage._visit_dirs(short_code):
+                import shutil
+                shutil.rmtree(archive_dir)
+        return deleted
+
+    @staticmethod
+    def get_visits(link_code: str, start: str | None = None, end: str | None = None) -> List[Dict]:
+        # Arşivlenmiş bölümler (visits/<kod>/*.jsonl.gz) tablodaki kayıtlardan önce gelir
+        visits = []
+        for _, filepath, _ in JsonStorage._visit_partitions(link_code, start, end, archived=True):
+            visits.extend(JsonStorage._read_jsonl(filepath))
+        visits = JsonStorage._filter_visits(visits, start, end)
+        query = 'SELECT * FROM visits WHERE link_code = ?'
+        params = [link_code]
+        if start is not None:
+            query += ' AND visit_time >= ?'
+            params.append(start)
+        if end is not None:
+            query += ' AND visit_time < ?'
+            params.append(end)
+        rows = SqliteStorage._conn().execute(query + ' ORDER BY id', params).fetchall()
+        return visits + [SqliteStorage._visit_from_row(row) for row in rows]
+
+    @staticmethod
+    def iter_visits(link_code: str, start: str | None = None, end: str | None = None,
+                    position: tuple | None = None):
+        # Önce arşivler (konum [bölüm, bayt ofseti]), sonra tablo (konum [None, id]) okunur
+        if not position or position[0] is not None:
+            partitions = JsonStorage._visit_partitions(link_code, start, end, archived=True)
+            yield from JsonStorage._iter_partitions(partitions, start, end, position)
+        query = 'SELECT * FROM visits WHERE link_code = ? AND id > ?'
+        params = [link_code, position[1] if position and position[0] is None else 0]
+        if start is not None:
+            query += ' AND visit_time >= ?'
+            params.append(start)
+        if end is not None:
+            query += ' AND visit_time < ?'
+            params.append(end)
+        cursor = SqliteStorage._conn().execute(query + ' ORDER BY id', params)
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for row in rows:
+                yield (None, row['id']), SqliteStorage._visit_from_row(row)
+
+    @staticmethod
+    def valid_visit_position(position: tuple) -> bool:
+        # Arşiv konumu [bölüm anahtarı, bayt ofseti], tablo konumu [None, id]
+        return (len(position) == 2 and (position[0] is None or isinstance(position[0], str))
+                and type(position[1]) is int and position[1] >= 0)
+
+    @staticmethod
+    def save_visit(link_code: str, visit_data: Dict):
+        SqliteStorage.save_visits(link_code, [visit_data])
+
+    @staticmethod
+    def save_visits(link_code: str, visits: List[Dict]):
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.executemany(
+                'INSERT INTO visits (link_code, ip_address, user_agent, referrer, step, visit_time) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(link_code, v.get('ip_address'), v.get('user_agent'),
+                  v.get('referrer'), v.get('step'), v['visit_time']) for v in visits]
+            )
+
+    @staticmethod
+    def migrate_visits(force: bool = False) -> int:
+        # Ziyaretler zaten tabloda; eski JSON ağacı import-json ile aktarılır
+        return 0
 
     @staticmethod
     def get_stats() -> Dict:
-        return Storage._read_json(STATS_FILE, {'total_links': 0, 'active_links': 0, 'total_clicks': 0, 'total_visits': 0})
+        stats = {'total_links': 0, 'active_links': 0, 'total_clicks': 0, 'total_visits': 0}
+        for row in SqliteStorage._conn().execute('SELECT key, value FROM stats'):
+            stats[row['key']] = row['value']
+        return stats
 
     @staticmethod
     def save_stats(stats_data: Dict):
-        Storage._write_json(STATS_FILE, stats_data)
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)',
+                list(stats_data.items())
+            )
+
+    @staticmethod
+    def add_stats(deltas: Dict):
+        conn = SqliteStorage._conn()
+        with conn:
+            for key, delta in deltas.items():
+                conn.execute(
+                    'INSERT INTO stats (key, value) VALUES (?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET value = value + excluded.value',
+                    (key, delta)
+                )
+
+    @staticmethod
+    def compact_stats() -> int:
+        # SQLite'ta artışlar zaten atomik UPDATE ile uygulanır
+        return 0
+
+    @staticmethod
+    def add_link_counts(short_code: str, deltas: Dict):
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.execute(
+                'UPDATE links SET click_count = click_count + ?, visits_count = visits_count + ? '
+                'WHERE short_code = ?',
+                (deltas.get('click_count', 0), deltas.get('visits_count', 0), short_code)
+            )
+        link_cache.invalidate(short_code)
+
+    @staticmethod
+    def add_funnel_counts(deltas: Dict):
+        conn = SqliteStorage._conn()
+        with conn:
+            conn.executemany(
+                'INSERT INTO funnels (link_code, day, step, count) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(link_code, day, step) DO UPDATE SET count = count + excluded.count',
+                [(short_code, day, step, delta)
+                 for short_code, days in deltas.items()
+                 for day, steps in days.items()
+                 for step, delta in steps.items()]
+            )
+
+    @staticmethod
+    def get_funnel(short_code: str, start: str, end: str) -> Dict:
+        rows = SqliteStorage._conn().execute(
+            'SELECT day, step, count FROM funnels WHERE link_code = ? AND day >= ? AND day <= ?',
+            (short_code, start, end)
+        ).fetchall()
+        funnel = {}
+        for row in rows:
+            funnel.setdefault(row['day'], {})[row['step']] = row['count']
+        return funnel
+
+    @staticmethod
+    def count_visits(link_code: str) -> int:
+        archived = JsonStorage._count_partition_lines(JsonStorage._visit_partitions(link_code, archived=True))
+        return archived + SqliteStorage._conn().execute(
+            'SELECT COUNT(*) FROM visits WHERE link_code = ?', (link_code,)
+        ).fetchone()[0]
+
+    @staticmethod
+    def archive_visits(archive_after_days: int = VISIT_ARCHIVE_AFTER_DAYS,
+                       retention_days: int = VISIT_RETENTION_DAYS) -> Dict:
+        # Eski kayıtlar tablodan visits/<kod>/<bölüm>.jsonl.gz arşivlerine taşınır
+        archive_cutoff = JsonStorage._partition_cutoff(archive_after_days)
+        retention_cutoff = JsonStorage._partition_cutoff(retention_days)
+        result = {'archived': 0, 'pruned': 0}
+        conn = SqliteStorage._conn()
+        if retention_cutoff:
+            for link_code in JsonStorage._iter_visit_codes():
+                for key, filepath, _ in JsonStorage._visit_partitions(link_code, archived=True):
+                    if key < retention_cutoff:
+                        JsonStorage._remove_partition(filepath)
+                        result['pruned'] += 1
+            with conn:
+                result['pruned'] += conn.execute(
+                    'DELETE FROM visits WHERE visit_time < ?', (retention_cutoff,)
+                ).rowcount
+        if archive_cutoff and (not retention_cutoff or archive_cutoff > retention_cutoff):
+            rows = conn.execute(
+                'SELECT * FROM visits WHERE visit_time >= ? AND visit_time < ? ORDER BY id',
+                (retention_cutoff or '', archive_cutoff)
+            ).fetchall()
+            partitions = {}
+            for row in rows:
+                key = (row['link_code'], JsonStorage._partition_key(row['visit_time']))
+                partitions.setdefault(key, []).append(SqliteStorage._visit_from_row(row))
+            for (link_code, key), visits in partitions.items():
+                link_visits_dir = JsonStorage._visits_dir(link_code)
+                JsonStorage._merge_jsonl(os.path.join(link_visits_dir, f'{key}.jsonl.gz'), visits)
+            # Arşiv dosyaları yazıldıktan sonra silinir; yarıda kalırsa birleştirme tekrarları eler
+            with conn:
+                conn.execute(
+                    'DELETE FROM visits WHERE visit_time >= ? AND visit_time < ?',
+                    (retention_cutoff or '', archive_cutoff)
+                )
+            result['archived'] = len(partitions)
+        return result
+
+    @staticmethod
+    def rebuild_visit_counts() -> int:
+        conn = SqliteStorage._conn()
+        with conn:
+            cursor = conn.execute(
+                'UPDATE links SET visits_count = '
+                '(SELECT COUNT(*) FROM visits WHERE visits.link_code = links.short_code)'
+            )
+            for link_code in JsonStorage._iter_visit_codes():
+                archived = JsonStorage._count_partition_lines(JsonStorage._visit_partitions(link_code, archived=True))
+                if archived:
+                    conn.execute(
+                        'UPDATE links SET visits_count = visits_count + ? WHERE short_code = ?', (archived, link_code)
+                    )
+        link_cache.clear()
+        return cursor.rowcount
+
+    @staticmethod
+    def rebuild_url_index() -> int:
+        conn = SqliteStorage._conn()
+        rows = conn.execute(
+            'SELECT short_code, original_url FROM links WHERE is_active = 1 ORDER BY created_at, short_code'
+        ).fetchall()
+        indexed = {normalize_url(row['original_url']): row['short_code'] for row in rows}
+        with conn:
+            conn.execute('DELETE FROM url_index')
+            conn.executemany('INSERT INTO url_index (url, short_code) VALUES (?, ?)', indexed.items())
+        return len(indexed)
+
+    @staticmethod
+    def import_json_tree() -> Dict:
+        # Mevcut data/ ağacını (linkler, ziyaretler, istatistikler) SQLite'a aktarır
+        JsonStorage.migrate_visits(force=True)
+        conn = SqliteStorage._conn()
+        result = {'links': 0, 'visits': 0}
+        for link_data in JsonStorage.get_links():
+            # Arşivlenmiş bölümler yerinde kalır ve SQLite backend'inde de arşiv olarak okunur
+            visits = []
+            for _, filepath, _ in JsonStorage._visit_partitions(link_data['short_code'], archived=False):
+                visits.extend(JsonStorage._read_jsonl(filepath))
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO links (short_code, original_url, click_count, visits_count, created_at, is_active) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (link_data['short_code'], link_data['original_url'], link_data.get('click_count', 0),
+                     JsonStorage.count_visits(link_data['short_code']), link_data.get('created_at', ''),
+                     int(link_data.get('is_active', True)))
+                )
+                conn.execute('DELETE FROM visits WHERE link_code = ?', (link_data['short_code'],))
+                conn.executemany(
+                    'INSERT INTO visits (link_code, ip_address, user_agent, referrer, step, visit_time) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(link_data['short_code'], v.get('ip_address'), v.get('user_agent'),
+                      v.get('referrer'), v.get('step'), v.get('visit_time', '')) for v in visits]
+                )
+            result['links'] += 1
+            result['visits'] += len(visits)
+        SqliteStorage.save_stats(JsonStorage.get_stats())
+        link_cache.clear()
+        return result
+
+Storage = SqliteStorage if STORAGE_BACKEND == 'sqlite' else JsonStorage
+
+# Kısa kod üretici: kalıcı sayaç + anahtarlı Feistel karıştırma (bijeksiyon)
+class ShortCodeAllocator:
+    ALPHABET = string.ascii_letters + string.digits
+    MIN_LENGTH = 6
+    ROUNDS = 4
+
+    def __init__(self, block_size: int = 1000):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._next = 0
+        self._end = 0
+        self._round_keys = []
+        self.blocks_leased = 0
+        self.allocated = 0
+        self.collisions = 0
+
+    def allocate(self) -> str:
+        with self._lock:
+            # fork sonrası veya blok bitince yeni blok kiralanır
+            if self._pid != os.getpid() or self._next >= self._end:
+                start, key = Storage.lease_code_block(self.block_size)
+                self._round_keys = self._derive_round_keys(key)
+                self._pid = os.getpid()
+                self._next, self._end = start, start + self.block_size
+                self.blocks_leased += 1
+            number = self._next
+            self._next += 1
+            self.allocated += 1
+        return self.encode(number)
+
+    def encode(self, number: int) -> str:
+        # 6 karakterlik alan dolunca 7, sonra 8... karakterlik alana geçilir
+        length = self.MIN_LENGTH
+        base = len(self.ALPHABET)
+        while number >= base ** length:
+            number -= base ** length
+            length += 1
+        value = self._permute(number, base ** length)
+        chars = []
+        for _ in range(length):
+            value, index = divmod(value, base)
+            chars.append(self.ALPHABET[index])
+        return ''.join(reversed(chars))
+
+    def _derive_round_keys(self, key: bytes) -> List[int]:
+        digest = hashlib.blake2b(key, digest_size=8 * self.ROUNDS).digest()
+        return [int.from_bytes(digest[i * 8:(i + 1) * 8], 'big') for i in range(self.ROUNDS)]
+
+    def _permute(self, value: int, domain: int) -> int:
+        # Çift bit genişliğinde Feistel ağı; alan dışına düşen değerler tekrar şifrelenir
+        bits = domain.bit_length()
+        bits += bits % 2
+        half = bits // 2
+        mask = (1 << half) - 1
+        while True:
+            left, right = value >> half, value & mask
+            for round_key in self._round_keys:
+                mixed = ((right ^ round_key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+                left, right = right, left ^ ((mixed >> 29) & mask)
+            value = (left << half) | right
+            if value < domain:
+                return value
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'block_size': self.block_size,
+                'blocks_leased': self.blocks_leased,
+                'allocated': self.allocated,
+                'collisions': self.collisions,
+                'remaining_in_block': max(self._end - self._next, 0)
+            }
+
+code_allocator = ShortCodeAllocator(CODE_BLOCK_SIZE)
+
+# Sayaç tamponu: istatistik ve tıklama artışlarını bellekte biriktirip toplu yazar
+class CounterBuffer:
+    def __init__(self, flush_interval: float = 5.0, flush_threshold: int = 100):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.flush_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._links = {}
+        self._funnels = {}
+        self._inflight_stats = {}
+        self._inflight_links = {}
+        self._inflight_funnels = {}
+        self._pending = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.flushes = 0
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='counter-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                app.logger.exception('Sayaçlar yazılamadı')
+
+    def incr(self, key: str, delta: int = 1):
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + delta
+            self._pending += 1
+            self._start()
+            if self._pending >= self.flush_threshold:
+                self._wakeup.set()
+
+    def incr_link(self, short_code: str, field: str, delta: int = 1):
+        with self._lock:
+            fields = self._links.setdefault(short_code, {})
+            fields[field] = fields.get(field, 0) + delta
+            self._pending += 1
+            self._start()
+            if self._pending >= self.flush_threshold:
+                self._wakeup.set()
+
+    def incr_funnel(self, short_code: str, step: int, delta: int = 1):
+        # Link başına ve tüm linklerin toplamı (FUNNEL_TOTAL) için günlük adım sayacı
+        day = datetime.now().date().isoformat()
+        with self._lock:
+            for key in (short_code, FUNNEL_TOTAL):
+                steps = self._funnels.setdefault(key, {}).setdefault(day, {})
+                steps[step] = steps.get(step, 0) + delta
+            self._pending += 1
+            self._start()
+            if self._pending >= self.flush_threshold:
+                self._wakeup.set()
+
+    def flush(self):
+        with self.flush_lock:
+            with self._lock:
+                if not self._stats and not self._links and not self._funnels:
+                    return
+                self._inflight_stats, self._stats = self._stats, {}
+                self._inflight_links, self._links = self._links, {}
+                self._inflight_funnels, self._funnels = self._funnels, {}
+                self._pending = 0
+            
+            # Yazma bitene kadar bekleyen değerler okuyuculara görünür kalır; yazılan her parça
+            # hemen düşülür, hata olursa yazılamayanlar bir sonraki flush'ta tekrar denenir
+            try:
+                if self._inflight_stats:
+                    Storage.add_stats(self._inflight_stats)
+                    with self._lock:
+                        self._inflight_stats = {}
+                for short_code in list(self._inflight_links):
+                    Storage.add_link_counts(short_code, self._inflight_links[short_code])
+                    with self._lock:
+                        del self._inflight_links[short_code]
+                for short_code in list(self._inflight_funnels):
+                    Storage.add_funnel_counts({short_code: self._inflight_funnels[short_code]})
+                    with self._lock:
+                        del self._inflight_funnels[short_code]
+            except Exception:
+                with self._lock:
+                    self._merge_counts(self._stats, self._inflight_stats)
+                    self._merge_counts(self._links, self._inflight_links)
+                    self._merge_counts(self._funnels, self._inflight_funnels)
+                    self._inflight_stats = {}
+                    self._inflight_links = {}
+                    self._inflight_funnels = {}
+                    self._pending += 1
+                raise
+            
+            with self._lock:
+                self.flushes += 1
+
+    @staticmethod
+    def _merge_counts(target: Dict, source: Dict):
+        # İç içe sayaç sözlüklerini toplar
+        for key, value in source.items():
+            if isinstance(value, dict):
+                CounterBuffer._merge_counts(target.setdefault(key, {}), value)
+            else:
+                target[key] = target.get(key, 0) + value
+
+    def pending_link(self, short_code: str, field: str) -> int:
+        with self._lock:
+            return (self._links.get(short_code, {}).get(field, 0)
+                    + self._inflight_links.get(short_code, {}).get(field, 0))
+
+    def get_funnel(self, short_code: str, start: str, end: str) -> Dict:
+        funnel = Storage.get_funnel(short_code, start, end)
+        with self._lock:
+            for pending in (self._inflight_funnels, self._funnels):
+                for day, steps in pending.get(short_code, {}).items():
+                    if start <= day <= end:
+                        counts = funnel.setdefault(day, {})
+                        for step, delta in steps.items():
+                            counts[step] = counts.get(step, 0) + delta
+        return funnel
+
+    def get_stats(self) -> Dict:
+        stats = Storage.get_stats()
+        with self._lock:
+            for deltas in (self._inflight_stats, self._stats):
+                for key, delta in deltas.items():
+                    stats[key] = stats.get(key, 0) + delta
+        return stats
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'pending_updates': self._pending,
+                'pending_stats': dict(self._stats),
+                'pending_links': len(self._links),
+                'pending_funnels': len(self._funnels),
+                'flushes': self.flushes,
+                'flush_interval': self.flush_interval,
+                'flush_threshold': self.flush_threshold
+            }
+
+# Tüm linklerin huni toplamının anahtarı (kısa kodlar yalnızca harf/rakamdır, çakışmaz)
+FUNNEL_TOTAL = '_total'
+
+counters = CounterBuffer(COUNTER_FLUSH_INTERVAL, COUNTER_FLUSH_THRESHOLD)
+atexit.register(counters.flush)
 
 # Link sınıfı
 class Link:
     def __init__(self, original_url, short_code=None):
         self.original_url = original_url
-        self.short_code = short_code or self._generate_short_code()
+        self.short_code = short_code
         self.click_count = 0
+        self.visits_count = 0
         self.created_at = datetime.now().isoformat()
         self.is_active = True
-        self.save()
+        if short_code:
+            self.save()
+        else:
+            self._create()
     
-    def _generate_short_code(self):
-        while True:
-            code = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
-            if not Storage.get_link(code):
-                return code
+    def _create(self):
+        Link.create_batch([self])
     
-    def save(self):
-        data = {
+    @staticmethod
+    def create_batch(links):
+        # Üretilen kodlar benzersizdir; eski rastgele kodlarla çakışma atomik oluşturmada yakalanır
+        pending = list(links)
+        while pending:
+            for link in pending:
+                link.short_code = code_allocator.allocate()
+            created = Storage.create_links([link._to_data() for link in pending])
+            pending = [link for link, ok in zip(pending, created) if not ok]
+            code_allocator.collisions += len(pending)
+        return links
+    
+    @staticmethod
+    def new_batch(original_urls):
+        links = []
+        created_at = datetime.now().isoformat()
+        for original_url in original_urls:
+            link = Link.__new__(Link)
+            link.original_url = original_url
+            link.short_code = None
+            link.click_count = 0
+            link.visits_count = 0
+            link.created_at = created_at
+            link.is_active = True
+            links.append(link)
+        return Link.create_batch(links)
+    
+    def _to_data(self):
+        return {
             'short_code': self.short_code,
             'original_url': self.original_url,
             'click_count': self.click_count,
+            'visits_count': self.visits_count,
             'created_at': self.created_at,
             'is_active': self.is_active
         }
-        Storage.save_link(data)
+    
+    def save(self):
+        Link.save_many([self])
+    
+    @staticmethod
+    def save_many(links):
+        with counters.flush_lock:
+            links_data = []
+            for link in links:
+                data = link._to_data()
+                # Sayaç alanları sayaç tamponuna aittir; diskteki güncel değerler korunur
+                stored = Storage.load_link(link.short_code)
+                if stored:
+                    data['click_count'] = stored.get('click_count', 0)
+                    data['visits_count'] = stored.get('visits_count', 0)
+                links_data.append(data)
+            Storage.save_links(links_data)
     
     def increment_click(self):
         self.click_count += 1
-        self.save()
-        stats = Storage.get_stats()
-        stats['total_clicks'] += 1
-        Storage.save_stats(stats)
+        counters.incr_link(self.short_code, 'click_count')
+        counters.incr('total_clicks')
     
     def toggle_active(self):
-        self.is_active = not self.is_active
-        self.save()
-        stats = Storage.get_stats()
-        if self.is_active:
-            stats['active_links'] += 1
-        else:
-            stats['active_links'] -= 1
-        Storage.save_stats(stats)
+        # Yeni durum ve istatistik farkı önbellekten değil diskteki kayıttan hesaplanır
+        stored = Storage.load_link(self.short_code)
+        if not stored:
+            return False
+        self.is_active = not stored['is_active']
+        if Storage.set_links_active([self.short_code], self.is_active):
+            counters.incr('active_links', 1 if self.is_active else -1)
+        return True
+    
+    def delete(self):
+        deleted = Storage.delete_link(self.short_code)
+        visit_index.forget(self.short_code)
+        if not deleted:
+            return False
+        counters.incr('total_links', -1)
+        if deleted['is_active']:
+            counters.incr('active_links', -1)
+        return True
+    
+    @staticmethod
+    def set_active_many(links, is_active):
+        # Yalnızca diskteki durumu değişen linkler sayılır; istatistik tek seferde güncellenir
+        if not links:
+            return []
+        changed_codes = set(Storage.set_links_active([link.short_code for link in links], is_active))
+        for link in links:
+            link.is_active = is_active
+        if changed_codes:
+            counters.incr('active_links', len(changed_codes) if is_active else -len(changed_codes))
+        return [link for link in links if link.short_code in changed_codes]
+    
+    @staticmethod
+    def delete_many(links):
+        # Silinen kayıt sayısı ve aktiflik diskten gelir; başka worker'ın sildiği link sayılmaz
+        if not links:
+            return 0
+        deleted = Storage.delete_links([link.short_code for link in links])
+        for link in links:
+            visit_index.forget(link.short_code)
+        if deleted:
+            counters.incr('total_links', -len(deleted))
+        active = sum(1 for link_data in deleted if link_data['is_active'])
+        if active:
+            counters.incr('active_links', -active)
+        return len(deleted)
+    
+    @staticmethod
+    def find(domain=None, created_before=None):
+        # created_before için katalog sırası kullanılır; yalnızca daha eski linkler okunur
+        cursor = (created_before, '') if created_before else None
+        links_data, _ = Storage.get_links_page(None, cursor)
+        links = []
+        for data in links_data:
+            if domain:
+                hostname = (urlparse(data['original_url']).hostname or '').lower()
+                if hostname != domain and not hostname.endswith('.' + domain):
+                    continue
+            links.append(Link._from_data(data))
+        return links
     
-    def delete(self):
-        Storage.delete_link(self.short_code)
-        stats = Storage.get_stats()
-        stats['total_links'] -= 1
-        if self.is_active:
-            stats['active_links'] -= 1
-        Storage.save_stats(stats)
+    @staticmethod
+    def find_by_url(original_url):
+        # Dedup kapalıysa veya indeks eskiyse (silinmiş/pasif/farklı URL) None döner
+        if not DEDUP_URLS:
+            return None
+        short_code = Storage.find_code_by_url(original_url)
+        if not short_code:
+            return None
+        link = Link.get_by_code(short_code)
+        if not link or not link.is_active or normalize_url(link.original_url) != normalize_url(original_url):
+            return None
+        return link
     
-    @property
-    def visits_count(self):
-        visits = Storage.get_visits(self.short_code)
-        return len(visits)
+    @staticmethod
+    def _from_data(data):
+        link = Link.__new__(Link)
+        link.short_code = data['short_code']
+        link.original_url = data['original_url']
+        link.click_count = data['click_count'] + counters.pending_link(link.short_code, 'click_count')
+        if 'visits_count' in data:
+            link.visits_count = data['visits_count']
+        else:
+            # rebuild-visit-counts çalıştırılmamış eski kayıt
+            link.visits_count = Storage.count_visits(link.short_code)
+        link.visits_count += counters.pending_link(link.short_code, 'visits_count')
+        link.created_at = data['created_at']
+        link.is_active = data['is_active']
+        return link
     
     @staticmethod
     def get_all():
-        links_data = Storage.get_links()
-        links = []
-        for data in links_data:
-            link = Link.__new__(Link)
-            link.short_code = data['short_code']
-            link.original_url = data['original_url']
-            link.click_count = data['click_count']
-            link.created_at = data['created_at']
-            link.is_active = data['is_active']
-            links.append(link)
-        return links
+        return [Link._from_data(data) for data in Storage.get_links()]
+    
+    @staticmethod
+    def get_page(limit=None, cursor=None):
+        links_data, next_cursor = Storage.get_links_page(limit, cursor)
+        return [Link._from_data(data) for data in links_data], next_cursor
     
     @staticmethod
     def get_by_code(short_code):
         data = Storage.get_link(short_code)
         if data:
-            link = Link.__new__(Link)
-            link.short_code = data['short_code']
-            link.original_url = data['original_url']
-            link.click_count = data['click_count']
-            link.created_at = data['created_at']
-            link.is_active = data['is_active']
-            return link
+            return Link._from_data(data)
+        return None
+
+    @staticmethod
+    def load_by_code(short_code):
+        # Yazma yolları için: önbelleği atlayarak diskten okur
+        data = Storage.load_link(short_code)
+        if data:
+            return Link._from_data(data)
         return None
 
+# Günlük ziyaret indeksi (link -> [bugün görülen IP'ler, bugünün bölümünde okunan son konum])
+class DailyVisitIndex:
+    def __init__(self):
+        self._day = None
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def _roll_over(self) -> str:
+        # Gün değiştiyse önceki günün kayıtları bellekten atılır
+        today = datetime.now().date().isoformat()
+        if self._day != today:
+            self._day = today
+            self._seen = {}
+        return today
+
+    def has_visited(self, link_code: str, ip_address: str) -> bool:
+        # Bellekteki "görüldü" sonucuna güvenilir; bulunamazsa diğer worker'ların yazdığı
+        # ziyaretler için bugünün bölümü kaldığı konumdan itibaren yeniden okunur
+        with self._lock:
+            today = self._roll_over()
+            entry = self._seen.get(link_code)
+            if entry is not None and ip_address in entry[0]:
+                return True
+            position = entry[1] if entry else None
+        
+        ips = set()
+        for position, visit in Storage.iter_visits(link_code, start=today, position=position):
+            ips.add(visit.get('ip_address'))
+        
+        with self._lock:
+            if self._roll_over() != today:
+                return ip_address in ips
+            entry = self._seen.setdefault(link_code, [set(), None])
+            entry[0].update(ips)
+            if position is not None:
+                entry[1] = position
+            return ip_address in entry[0]
+
+    def add(self, link_code: str, ip_address: str, visit_time: str):
+        with self._lock:
+            today = self._roll_over()
+            entry = self._seen.get(link_code)
+            # Henüz yüklenmemiş linkler ilk sorguda diskten okunur
+            if entry is not None and visit_time.startswith(today):
+                entry[0].add(ip_address)
+
+    def forget(self, link_code: str):
+        with self._lock:
+            self._seen.pop(link_code, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'day': self._day,
+                'links': len(self._seen),
+                'ips': sum(len(entry[0]) for entry in self._seen.values())
+            }
+
+visit_index = DailyVisitIndex()
+
+# Ziyaret kuyruğu: kayıtlar arka planda link bazında gruplanarak yazılır
+class VisitQueue:
+    def __init__(self, maxsize: int, policy: str = 'block', block_timeout: float = 1.0,
+                 sample_rate: float = 0.1, batch_size: int = 500):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize)
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.batches = 0
+        self.max_depth = 0
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='visit-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, visit_data: Dict):
+        if self.maxsize <= 0:
+            self._write([visit_data])
+            return
+        self._start()
+        depth = self._queue.qsize()
+        # sample: kuyruk %80 dolduktan sonra ziyaretlerin yalnızca bir kısmı alınır
+        if self.policy == 'sample' and depth >= self.maxsize * 0.8 and random.random() >= self.sample_rate:
+            with self._lock:
+                self.sampled_out += 1
+            return
+        try:
+            if self.policy == 'block':
+                self._queue.put(visit_data, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(visit_data)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, min(depth + 1, self.maxsize))
+
+    def _drain(self, first: Dict | None = None) -> List[Dict]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict]):
+        grouped = {}
+        for visit_data in batch:
+            grouped.setdefault(visit_data['link_code'], []).append(visit_data)
+        with self._write_lock:
+            for link_code, visits in grouped.items():
+                Storage.save_visits(link_code, visits)
+                counters.incr_link(link_code, 'visits_count', len(visits))
+            counters.incr('total_visits', len(batch))
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+
+    def _process(self, batch: List[Dict]):
+        try:
+            self._write(batch)
+        except Exception:
+            app.logger.exception('Ziyaretler yazılamadı')
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while True:
+            self._process(self._drain(self._queue.get()))
+
+    def flush(self):
+        # Kuyrukta kalanlar çağıran thread'de yazılır; süren yazma işlemi beklenir
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            self._process(batch)
+        self._queue.join()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'depth': self._queue.qsize(),
+                'max_depth': self.max_depth,
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'sampled_out': self.sampled_out,
+                'batches': self.batches
+            }
+
+visit_queue = VisitQueue(VISIT_QUEUE_SIZE, VISIT_QUEUE_POLICY, VISIT_QUEUE_BLOCK_TIMEOUT,
+                         VISIT_QUEUE_SAMPLE_RATE, VISIT_QUEUE_BATCH_SIZE)
+atexit.register(visit_queue.flush)
+
 # LinkVisit sınıfı
 class LinkVisit:
     def __init__(self, link_code, ip_address, user_agent, referrer='', step=1):
@@ -219,25 +2215,16 @@ class LinkVisit:
             'step': self.step,
             'visit_time': self.visit_time
         }
-        Storage.save_visit(self.link_code, data)
-        stats = Storage.get_stats()
-        stats['total_visits'] += 1
-        Storage.save_stats(stats)
+        visit_index.add(self.link_code, self.ip_address, self.visit_time)
+        visit_queue.submit(data)
     
     @staticmethod
-    def get_visits(link_code):
-        return Storage.get_visits(link_code)
+    def get_visits(link_code, start=None, end=None):
+        return Storage.get_visits(link_code, start, end)
     
     @staticmethod
     def has_visited_today(link_code, ip_address):
-        visits = Storage.get_visits(link_code)
-        today = datetime.now().date()
-        
-        for visit in visits:
-            visit_date = datetime.fromisoformat(visit['visit_time']).date()
-            if visit['ip_address'] == ip_address and visit_date == today:
-                return True
-        return False
+        return visit_index.has_visited(link_code, ip_address)
 
 # Admin sınıfı
 class Admin:
@@ -269,20 +2256,429 @@ class Admin:
         return None
 
 # Güvenlik fonksiyonları
-rate_limit_data = {}
+RATE_LIMIT_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def parse_rate_rules(spec: str) -> List[tuple]:
+    rules = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        limit, _, unit = part.partition('/')
+        unit = unit.strip().lower().rstrip('s')
+        if unit not in RATE_LIMIT_UNITS:
+            raise ValueError(f'Geçersiz rate limit kuralı: {part}')
+        rules.append((int(limit), RATE_LIMIT_UNITS[unit]))
+    return rules
+
+# Kayan pencere sayacı: her kural için [pencere no, bu penceredeki, önceki penceredeki] tutulur.
+# Tahmin = önceki * (pencerenin kalan oranı) + bu pencere; kontrol kural başına O(1).
+# cost: isteğin düştüğü birim sayısı (toplu kısaltmada URL sayısı)
+def apply_rate_rules(states: List | None, rules: List[tuple], now: float, cost: int = 1) -> tuple:
+    new_states = []
+    retry_after = 0.0
+    for index, (limit, period) in enumerate(rules):
+        window = int(now // period)
+        elapsed = (now % period) / period
+        cur = prev = 0
+        if states and index < len(states):
+            state_window, state_cur, state_prev = states[index]
+            if state_window == window:
+                cur, prev = state_cur, state_prev
+            elif state_window == window - 1:
+                prev = state_cur
+        new_states.append([window, cur, prev])
+        if prev * (1 - elapsed) + cur + cost <= limit:
+            continue
+        # İzin verilen ilk ana kadar geçecek süre
+        if cur + cost <= limit:
+            wait = (1 - (limit - cost - cur) / prev - elapsed) * period
+        elif limit >= cost:
+            wait = (1 - elapsed) * period + max(0.0, 1 - (limit - cost) / cur) * period
+        else:
+            wait = period
+        retry_after = max(retry_after, wait, 0.001)
+    if retry_after:
+        return states, retry_after
+    for state in new_states:
+        state[1] += cost
+    return new_states, 0.0
+
+class RateLimiter:
+    def __init__(self, scopes: Dict[str, List[tuple]], max_keys: int = 100000):
+        self.scopes = scopes
+        self.max_keys = max_keys
+        self._entries = {scope: OrderedDict() for scope in scopes}
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+
+    def _idle_after(self, scope: str) -> float:
+        # İki pencere boyunca istek gelmeyen anahtarın sayaçları sıfırlanmıştır
+        return 2 * max(period for _, period in self.scopes[scope])
+
+    def hit(self, scope: str, key: str, now: float | None = None, cost: int = 1) -> float:
+        # İzin verilirse 0, aksi halde kaç saniye sonra tekrar denenebileceği döner
+        rules = self.scopes.get(scope)
+        if not rules:
+            return 0.0
+        now = time.time() if now is None else now
+        retry_after = self._check(scope, key, rules, now, cost)
+        with self._lock:
+            if retry_after:
+                self.limited += 1
+            else:
+                self.allowed += 1
+        return retry_after
+
+    def _check(self, scope: str, key: str, rules: List[tuple], now: float, cost: int = 1) -> float:
+        with self._lock:
+            entries = self._entries[scope]
+            entry = entries.pop(key, None)
+            states, retry_after = apply_rate_rules(entry[1] if entry else None, rules, now, cost)
+            if states is not None:
+                entries[key] = (now, states)
+            # En uzun süredir işlem görmeyenler baştadır; boşta kalanlar ve fazlalar atılır
+            idle_before = now - self._idle_after(scope)
+            while entries:
+                oldest_key, (last_seen, _) = next(iter(entries.items()))
+                if last_seen >= idle_before and len(entries) <= self.max_keys:
+                    break
+                del entries[oldest_key]
+                self.evictions += 1
+        return retry_after
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'keys': {scope: len(entries) for scope, entries in self._entries.items()},
+                'allowed': self.allowed,
+                'limited': self.limited,
+                'evictions': self.evictions
+            }
+
+# Worker'lar arası ortak limit: sayaçlar SQLite dosyasında tutulur
+class SqliteRateLimiter(RateLimiter):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            states TEXT NOT NULL,
+            last_seen REAL NOT NULL,
+            PRIMARY KEY (scope, key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_rate_limits_seen ON rate_limits (scope, last_seen);
+    """
+    # Bu kadar kontrolde bir boşta kalan anahtarlar silinir
+    PURGE_EVERY = 1000
+
+    def __init__(self, scopes: Dict[str, List[tuple]], max_keys: int = 100000, path: str = RATE_LIMIT_DB):
+        super().__init__(scopes, max_keys)
+        self.path = path
+        self._local = threading.local()
+        self._checks = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.executescript(self.SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _check(self, scope: str, key: str, rules: List[tuple], now: float, cost: int = 1) -> float:
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT states FROM rate_limits WHERE scope = ? AND key = ?', (scope, key)
+            ).fetchone()
+            states, retry_after = apply_rate_rules(json.loads(row[0]) if row else None, rules, now, cost)
+            if not retry_after:
+                conn.execute(
+                    'INSERT OR REPLACE INTO rate_limits (scope, key, states, last_seen) VALUES (?, ?, ?, ?)',
+                    (scope, key, json.dumps(states), now)
+                )
+            with self._lock:
+                self._checks += 1
+                purge = self._checks % self.PURGE_EVERY == 0
+            if purge:
+                removed = conn.execute(
+                    'DELETE FROM rate_limits WHERE scope = ? AND last_seen < ?',
+                    (scope, now - self._idle_after(scope))
+                ).rowcount
+                removed += conn.execute(
+                    'DELETE FROM rate_limits WHERE scope = ? AND key IN ('
+                    'SELECT key FROM rate_limits WHERE scope = ? ORDER BY last_seen DESC LIMIT -1 OFFSET ?)',
+                    (scope, scope, self.max_keys)
+                ).rowcount
+                with self._lock:
+                    self.evictions += removed
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def stats(self) -> Dict:
+        rows = self._conn().execute('SELECT scope, COUNT(*) FROM rate_limits GROUP BY scope').fetchall()
+        counts = dict(rows)
+        with self._lock:
+            return {
+                'backend': 'sqlite',
+                'keys': {scope: counts.get(scope, 0) for scope in self.scopes},
+                'allowed': self.allowed,
+                'limited': self.limited,
+                'evictions': self.evictions
+            }
+
+rate_limit_scopes = {
+    'shorten': parse_rate_rules(RATE_LIMIT_SHORTEN),
+    'batch': parse_rate_rules(RATE_LIMIT_BATCH),
+    'redirect': parse_rate_rules(RATE_LIMIT_REDIRECT)
+}
+if RATE_LIMIT_BACKEND == 'sqlite':
+    rate_limiter = SqliteRateLimiter(rate_limit_scopes, RATE_LIMIT_MAX_KEYS)
+else:
+    rate_limiter = RateLimiter(rate_limit_scopes, RATE_LIMIT_MAX_KEYS)
+
+RATE_LIMIT_MESSAGE = 'Çok fazla istek. Lütfen daha sonra tekrar deneyin.'
+
+def rate_limit_response(scope: str, as_json: bool = True, cost: int = 1):
+    # Limit aşıldıysa 429 yanıtı, aksi halde None döner
+    retry_after = rate_limiter.hit(scope, get_client_ip(), cost=cost)
+    if not retry_after:
+        return None
+    if as_json:
+        response = jsonify({'error': RATE_LIMIT_MESSAGE})
+    else:
+        response = Response(RATE_LIMIT_MESSAGE, mimetype='text/html')
+    response.status_code = 429
+    response.headers['Retry-After'] = str(int(retry_after) + 1)
+    return response
 
 def get_client_ip():
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-    elif request.headers.get('X-Real-IP'):
-        return request.headers.get('X-Real-IP')
+    return client_ip_from(request.headers, request.remote_addr)
+
+def is_trusted_proxy(addr) -> bool:
+    try:
+        ip = ipaddress.ip_address(addr)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+def client_ip_from(headers, remote_addr):
+    # İstemci başlıkları serbestçe yazabilir; yalnızca güvenilen proxy'nin eklediği değerler kullanılır
+    remote_addr = remote_addr or '127.0.0.1'
+    if not is_trusted_proxy(remote_addr):
+        return remote_addr
+    if headers.get('X-Forwarded-For'):
+        # Sağdan sola ilk güvenilmeyen adres gerçek istemcidir; soldaki değerler sahte olabilir
+        forwarded = [addr.strip() for addr in headers.get('X-Forwarded-For').split(',') if addr.strip()]
+        for addr in reversed(forwarded):
+            if not is_trusted_proxy(addr):
+                return addr
+        return forwarded[0] if forwarded else remote_addr
+    elif headers.get('X-Real-IP'):
+        return headers.get('X-Real-IP').strip()
     else:
-        return request.remote_addr or '127.0.0.1'
+        return remote_addr
+
+# Yönlendirme adımlarının zaman kaynağı; benchmark'larda 15 sn beklemeden ilerlemek için değiştirilir
+redirect_clock = time.time
+
+# Yönlendirme akışının oturum kuralları (WSGI ve ASGI yolları ortak kullanır)
+def start_redirect(state, short_code, client_ip, now):
+    state[f'link_{short_code}_step'] = 1
+    state[f'link_{short_code}_start_time'] = now
+    state[f'link_{short_code}_ip'] = client_ip
+
+def advance_redirect(state, short_code, step, client_ip, now):
+    # 'ok', 'restart' (baştan başlat) veya 'too_fast' döner
+    session_step_key = f'link_{short_code}_step'
+    session_time_key = f'link_{short_code}_start_time'
+    session_ip_key = f'link_{short_code}_ip'
+    
+    if session_step_key not in state:
+        return 'restart'
+    
+    current_session_step = state.get(session_step_key, 0)
+    session_ip = state.get(session_ip_key, '')
+    
+    if session_ip != client_ip:
+        return 'restart'
+    
+    if step != current_session_step + 1:
+        return 'restart'
+    
+    start_time = state.get(session_time_key, 0)
+    if now - start_time < (current_session_step * 15):
+        return 'too_fast'
+    
+    state[session_step_key] = step
+    return 'ok'
+
+def finish_redirect(state, short_code):
+    state.pop(f'link_{short_code}_step', None)
+    state.pop(f'link_{short_code}_start_time', None)
+    state.pop(f'link_{short_code}_ip', None)
+
+def record_visit(short_code, client_ip, user_agent, referrer, step):
+    # Botlar sayılmaz; huni her adım geçişini sayar, ziyaret ise IP başına günde bir kaydedilir
+    if ua_classifier.classify(user_agent):
+        return False
+    counters.incr_funnel(short_code, step)
+    if LinkVisit.has_visited_today(short_code, client_ip):
+        return False
+    LinkVisit(
+        link_code=short_code,
+        ip_address=client_ip,
+        user_agent=user_agent,
+        referrer=referrer,
+        step=step
+    )
+    return True
+
+def encode_cursor(parts) -> str:
+    raw = json.dumps(list(parts), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        parts = json.loads(raw)
+    except ValueError:
+        return None
+    return tuple(parts) if isinstance(parts, list) else None
+
+# Akış yanıtları satırları bu kadarlık parçalar halinde gönderir
+STREAM_CHUNK_LINES = 256
+VISITS_STREAM_MAX_LIMIT = 100000
+
+def stream_json_array(items):
+    # Öğeleri tek tek serileştirerek JSON dizisi üretir; tüm liste bellekte tutulmaz
+    lines = ['[']
+    for index, item in enumerate(items):
+        lines.append((',' if index else '') + json.dumps(item, ensure_ascii=False))
+        if len(lines) >= STREAM_CHUNK_LINES:
+            yield ''.join(lines)
+            lines = []
+    lines.append(']')
+    yield ''.join(lines)
+
+# Dışa aktarma: satırlar Storage'dan tembel okunur, bellekte yalnızca bir link sayfası tutulur
+EXPORT_COLUMNS = {
+    'links': ['short_code', 'original_url', 'click_count', 'visits_count', 'created_at', 'is_active'],
+    'visits': ['link_code', 'ip_address', 'user_agent', 'referrer', 'step', 'visit_time']
+}
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+def valid_export_cursor(kind: str, cursor: tuple) -> bool:
+    # links: (created_at, short_code); visits: (created_at, short_code, bölüm, konum)
+    if len(cursor) != (2 if kind == 'links' else 4) or not all(isinstance(part, str) for part in cursor[:2]):
+        return False
+    return kind == 'links' or Storage.valid_visit_position(cursor[2:])
+
+def iter_export_rows(kind: str, cursor: tuple | None = None):
+    # (cursor, satır) üretir; cursor ilgili satırdan sonrasına devam etmek için kullanılır
+    link_cursor = tuple(cursor[:2]) if cursor else None
+    if kind == 'visits' and cursor:
+        # Yarıda kalan linkin ziyaretleri kaldığı konumdan tamamlanır
+        for position, visit in Storage.iter_visits(cursor[1], position=tuple(cursor[2:])):
+            yield (*link_cursor, *position), {'link_code': cursor[1], **visit}
+    while True:
+        links_data, next_cursor = Storage.get_links_page(EXPORT_PAGE_SIZE, link_cursor)
+        for link_data in links_data:
+            link = Link._from_data(link_data)
+            link_cursor = (link.created_at, link.short_code)
+            if kind == 'links':
+                yield link_cursor, {column: getattr(link, column) for column in EXPORT_COLUMNS['links']}
+                continue
+            for position, visit in Storage.iter_visits(link.short_code):
+                yield (*link_cursor, *position), {'link_code': link.short_code, **visit}
+        if next_cursor is None:
+            break
+
+def iter_export_chunks(kind: str, fmt: str, cursor: tuple | None = None, limit: int | None = None,
+                       header: bool = True):
+    # (metin parçası, son satırın cursor'ı) üretir. limit dolduğunda devamı varsa son satır
+    # NDJSON'da {"next_cursor": "..."}, CSV'de "# next_cursor: ..." olur
+    columns = EXPORT_COLUMNS[kind]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if fmt == 'csv' and header:
+        writer.writerow(columns)
+    emitted = 0
+    lines = 0
+    last_cursor = cursor
+    for row_cursor, row in iter_export_rows(kind, cursor):
+        if limit is not None and emitted == limit:
+            next_cursor = encode_cursor(last_cursor)
+            if fmt == 'csv':
+                buffer.write(f'# next_cursor: {next_cursor}\n')
+            else:
+                buffer.write(json.dumps({'next_cursor': next_cursor}) + '\n')
+            break
+        if fmt == 'csv':
+            writer.writerow([row.get(column) for column in columns])
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False) + '\n')
+        emitted += 1
+        lines += 1
+        last_cursor = row_cursor
+        if lines >= STREAM_CHUNK_LINES:
+            yield buffer.getvalue(), last_cursor
+            buffer.seek(0)
+            buffer.truncate()
+            lines = 0
+    if buffer.tell():
+        yield buffer.getvalue(), last_cursor
+
+def gzip_stream(chunks):
+    # Parçaları anında gzip ile sıkıştırır; çıktı tek bir gzip üyesidir
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def parse_page_args(default_limit=None, max_limit=500):
+    # ?limit=&cursor= parametrelerini doğrular; hata durumunda mesaj döner
+    limit = request.args.get('limit', default_limit)
+    cursor = request.args.get('cursor')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return None, None, 'Geçersiz limit'
+        if limit < 1:
+            return None, None, 'Geçersiz limit'
+        limit = min(limit, max_limit)
+    if cursor:
+        cursor = decode_cursor(cursor)
+        if cursor is None:
+            return None, None, 'Geçersiz cursor'
+    return limit, cursor or None, None
+
+# validate_url saf bir fonksiyondur; sonuçlar URL'ye göre önbelleklenir
+validate_cache = LRUCache(VALIDATE_CACHE_SIZE, ttl=None)
 
 def validate_url(url):
     if not url or len(url) > 2048:
         return False, "URL çok uzun"
     
+    result = validate_cache.get(url)
+    if result is None:
+        result = _validate_url(url)
+        validate_cache.set(url, result)
+    return result
+
+def _validate_url(url):
     if not validators.url(url):
         return False, "Geçersiz URL formatı"
     
@@ -291,19 +2687,200 @@ def validate_url(url):
     
     return True, "OK"
 
+# Dedup indeksinin anahtarı: şema/host küçük harf, varsayılan port ve boş path normalize edilir
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    try:
+        parsed = urlparse(url)
+        port = parsed.port
+    except ValueError:
+        return url
+    scheme = parsed.scheme.lower()
+    host = parsed.hostname or ''
+    if ':' in host:
+        host = f'[{host}]'
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{port}'
+    if parsed.username is not None:
+        userinfo = parsed.username + (f':{parsed.password}' if parsed.password is not None else '')
+        host = f'{userinfo}@{host}'
+    return urlunparse((scheme, host, parsed.path or '/', parsed.params, parsed.query, parsed.fragment))
+
+# Bot tespiti: tüm desenler tek bir regex'te derlenir, sonuçlar ham UA'ya göre önbelleklenir
+DEFAULT_UA_PATTERNS = [
+    ('bot', 'bot'),
+    ('crawler', 'crawler'),
+    ('crawler', 'spider'),
+    ('scraper', 'scraper'),
+    ('cli', 'curl'),
+    ('cli', 'wget'),
+    ('library', 'python'),
+    ('library', 'requests')
+]
+
+def parse_ua_patterns(text: str) -> List[tuple]:
+    # Her satır: "<kategori> <regex>"; boş satırlar ve # ile başlayanlar atlanır.
+    # Desenler küçük harfe çevrilmiş UA üzerinde aranır.
+    patterns = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        category, _, pattern = line.partition(' ')
+        if not pattern.strip():
+            raise ValueError(f'Geçersiz desen satırı: {line}')
+        patterns.append((category, pattern.strip()))
+    return patterns
+
+def compile_ua_patterns(patterns: List[tuple]):
+    # Tek bir birleşik regex hızlı evet/hayır kontrolü yapar (yakalama grubu yok, motor
+    # optimizasyonları korunur); eşleşmede kategori, dosyadaki sıraya göre ilk eşleşendir
+    groups = OrderedDict()
+    for category, pattern in patterns:
+        groups.setdefault(category, []).append(f'(?:{pattern})')
+    if not groups:
+        return None, []
+    combined = re.compile('|'.join(alternative for group in groups.values() for alternative in group))
+    categories = [(name, re.compile('|'.join(group))) for name, group in groups.items()]
+    return combined, categories
+
+class UserAgentClassifier:
+    def __init__(self, filepath: str, cache_size: int = 4096, check_interval: float = 10.0):
+        self.filepath = filepath
+        self.check_interval = check_interval
+        self._cache = LRUCache(cache_size, ttl=None)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self._counts = {}
+        self.source = 'default'
+        self.error = None
+        self.reloads = 0
+        self._matcher, self._categories = compile_ua_patterns(DEFAULT_UA_PATTERNS)
+        self.reload()
+
+    def reload(self) -> bool:
+        # Dosya değiştiyse desenleri yeniden derler; hatalı dosyada eski desenler korunur
+        try:
+            mtime = os.path.getmtime(self.filepath)
+        except OSError:
+            mtime = None
+        with self._lock:
+            self._checked_at = time.time()
+            if mtime == self._mtime:
+                return False
+        try:
+            if mtime is None:
+                patterns, source = DEFAULT_UA_PATTERNS, 'default'
+            else:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    patterns, source = parse_ua_patterns(f.read()), self.filepath
+            matcher, categories = compile_ua_patterns(patterns)
+        except (OSError, ValueError, re.error) as e:
+            app.logger.error('User-Agent desenleri yüklenemedi: %s', e)
+            with self._lock:
+                self._mtime = mtime
+                self.error = str(e)
+            return False
+        with self._lock:
+            self._matcher, self._categories = matcher, categories
+            self._mtime = mtime
+            self.source = source
+            self.error = None
+            self.reloads += 1
+        self._cache.clear()
+        return True
+
+    def classify(self, user_agent: str) -> str:
+        # Bot kategorisini, insan ise boş string döner
+        if time.time() - self._checked_at >= self.check_interval:
+            self.reload()
+        category = self._cache.get(user_agent)
+        if category is None:
+            matcher, categories = self._matcher, self._categories
+            lowered = user_agent.lower()
+            category = ''
+            if matcher and matcher.search(lowered):
+                category = next(name for name, regex in categories if regex.search(lowered))
+            self._cache.set(user_agent, category)
+        with self._lock:
+            self._counts[category or 'human'] = self._counts.get(category or 'human', 0) + 1
+        return category
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'source': self.source,
+                'categories': [name for name, _ in self._categories],
+                'reloads': self.reloads,
+                'error': self.error,
+                'matches': dict(self._counts),
+                'cache': self._cache.stats()
+            }
+
+ua_classifier = UserAgentClassifier(UA_PATTERNS_FILE, UA_CACHE_SIZE, UA_PATTERNS_CHECK_INTERVAL)
+
 def is_bot_request():
-    user_agent = request.headers.get('User-Agent', '').lower()
-    bot_patterns = ['bot', 'crawler', 'spider', 'scraper', 'curl', 'wget', 'python', 'requests']
-    return any(pattern in user_agent for pattern in bot_patterns)
+    return bool(ua_classifier.classify(request.headers.get('User-Agent', '')))
+
+# Statik sayfalar: açılışta bir kez render edilir, sıkıştırılır ve ETag'lenir
+class StaticPage:
+    def __init__(self, body: bytes, cache_control: str):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.cache_control = cache_control
+        self.variants = {
+            'identity': (body, digest),
+            'gzip': (gzip.compress(body, compresslevel=9), f'{digest}-gzip')
+        }
+        if brotli:
+            self.variants['br'] = (brotli.compress(body, quality=11), f'{digest}-br')
+
+    def _choose_encoding(self) -> str:
+        best, best_quality = 'identity', 0
+        for encoding in ('br', 'gzip'):
+            quality = request.accept_encodings[encoding] if encoding in self.variants else 0
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self) -> Response:
+        encoding = self._choose_encoding()
+        body, etag = self.variants[encoding]
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='text/html')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+# Adım sayfaları yalnızca (kod, adım) ikilisine bağlıdır; render edilmiş hali saklanır
+def step_page_body(short_code, step) -> bytes:
+    key = (short_code, step)
+    body = page_cache.get(key)
+    if body is None:
+        body = redirect_template.render(short_code=short_code, step=step).encode('utf-8')
+        page_cache.set(key, body)
+    return body
+
+def render_step_page(short_code, step):
+    return Response(step_page_body(short_code, step), mimetype='text/html')
 
 # Ana sayfa
 @app.route('/')
 def index():
-    return render_template_string(INDEX_TEMPLATE)
+    return index_page.response()
 
 # URL kısaltma
 @app.route('/api/shorten', methods=['POST'])
 def shorten_url():
+    limited = rate_limit_response('shorten')
+    if limited:
+        return limited
+    
     data = request.json
     original_url = data.get('url')
     
@@ -313,16 +2890,24 @@ def shorten_url():
     if is_bot_request():
         return jsonify({'error': 'Bot istekleri kabul edilmiyor'}), 403
     
+    # Dedup modunda aynı URL için mevcut kod döner; doğrulama ve yazma yapılmaz
+    existing = Link.find_by_url(original_url)
+    if existing:
+        return jsonify({
+            'short_code': existing.short_code,
+            'short_url': f'/l/{existing.short_code}',
+            'original_url': existing.original_url,
+            'existing': True
+        }), 200
+    
     is_valid, message = validate_url(original_url)
     if not is_valid:
         return jsonify({'error': message}), 400
     
     link = Link(original_url)
     
-    stats = Storage.get_stats()
-    stats['total_links'] += 1
-    stats['active_links'] += 1
-    Storage.save_stats(stats)
+    counters.incr('total_links')
+    counters.incr('active_links')
     
     return jsonify({
         'short_code': link.short_code,
@@ -330,97 +2915,152 @@ def shorten_url():
         'original_url': link.original_url
     }), 201
 
+# Toplu URL kısaltma: JSON dizisi ({"urls": [...]} de olur) veya NDJSON
+@app.route('/api/shorten/batch', methods=['POST'])
+def shorten_url_batch():
+    limited = rate_limit_response('batch')
+    if limited:
+        return limited
+    
+    if is_bot_request():
+        return jsonify({'error': 'Bot istekleri kabul edilmiyor'}), 403
+    
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            if len(items) >= BATCH_MAX_SIZE:
+                return jsonify({'error': f'En fazla {BATCH_MAX_SIZE} URL gönderilebilir'}), 413
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(ValueError)
+    else:
+        data = request.get_json(silent=True)
+        items = data.get('urls') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({'error': 'URL listesi gerekli'}), 400
+        if len(items) > BATCH_MAX_SIZE:
+            return jsonify({'error': f'En fazla {BATCH_MAX_SIZE} URL gönderilebilir'}), 413
+    
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        if item is ValueError:
+            results.append({'index': index, 'error': 'Geçersiz JSON satırı'})
+            continue
+        original_url = item.get('url') if isinstance(item, dict) else item
+        if not isinstance(original_url, str) or not original_url:
+            results.append({'index': index, 'error': 'URL gerekli'})
+            continue
+        result = {'index': index}
+        existing = Link.find_by_url(original_url)
+        if existing:
+            result.update({
+                'short_code': existing.short_code,
+                'short_url': f'/l/{existing.short_code}',
+                'original_url': existing.original_url,
+                'existing': True
+            })
+            results.append(result)
+            continue
+        is_valid, message = validate_url(original_url)
+        if not is_valid:
+            results.append({'index': index, 'url': original_url, 'error': message})
+            continue
+        results.append(result)
+        valid.append((result, original_url))
+    
+    # Dedup modunda istek içindeki tekrarlar da tek link paylaşır
+    positions = {}
+    new_urls = []
+    for result, original_url in valid:
+        key = normalize_url(original_url) if DEDUP_URLS else result['index']
+        if key not in positions:
+            positions[key] = len(new_urls)
+            new_urls.append(original_url)
+        result['position'] = positions[key]
+    
+    # Her yeni link tekli kısaltma gibi 'shorten' limitinden düşülür; 'batch' yalnızca istekleri sayar
+    if new_urls:
+        shorten_rules = rate_limiter.scopes.get('shorten')
+        max_cost = min(limit for limit, _ in shorten_rules) if shorten_rules else None
+        if max_cost is not None and len(new_urls) > max_cost:
+            return jsonify({'error': f'Bu istekle en fazla {max_cost} yeni URL kısaltılabilir'}), 413
+        limited = rate_limit_response('shorten', cost=len(new_urls))
+        if limited:
+            return limited
+    
+    links = Link.new_batch(new_urls)
+    for result, _ in valid:
+        link = links[result.pop('position')]
+        result.update({
+            'short_code': link.short_code,
+            'short_url': f'/l/{link.short_code}',
+            'original_url': link.original_url
+        })
+    
+    if links:
+        counters.incr('total_links', len(links))
+        counters.incr('active_links', len(links))
+    
+    return jsonify({
+        'created': len(links),
+        'failed': sum(1 for result in results if 'error' in result),
+        'results': results
+    })
+
 # Link yönlendirme
 @app.route('/l/<short_code>')
 def redirect_link(short_code):
+    limited = rate_limit_response('redirect', as_json=False)
+    if limited:
+        return limited
+    
     link = Link.get_by_code(short_code)
     
     if not link or not link.is_active:
         return "Link bulunamadı", 404
     
-    session[f'link_{short_code}_step'] = 1
-    session[f'link_{short_code}_start_time'] = time.time()
-    session[f'link_{short_code}_ip'] = get_client_ip()
-    
     client_ip = get_client_ip()
-    if not LinkVisit.has_visited_today(short_code, client_ip):
-        LinkVisit(
-            link_code=short_code,
-            ip_address=client_ip,
-            user_agent=request.headers.get('User-Agent', ''),
-            referrer=request.headers.get('Referer', ''),
-            step=1
-        )
+    start_redirect(session, short_code, client_ip, redirect_clock())
+    
+    record_visit(short_code, client_ip, request.headers.get('User-Agent', ''),
+                 request.headers.get('Referer', ''), 1)
     
-    return render_template_string(REDIRECT_TEMPLATE, short_code=short_code, step=1)
+    return render_step_page(short_code, 1)
 
 @app.route('/l/<short_code>/step/<int:step>')
 def redirect_step(short_code, step):
+    limited = rate_limit_response('redirect', as_json=False)
+    if limited:
+        return limited
+    
     link = Link.get_by_code(short_code)
     
     if not link or not link.is_active:
         return "Link bulunamadı", 404
     
-    session_step_key = f'link_{short_code}_step'
-    session_time_key = f'link_{short_code}_start_time'
-    session_ip_key = f'link_{short_code}_ip'
-    
-    if session_step_key not in session:
-        return redirect(f'/l/{short_code}')
-    
-    current_session_step = session.get(session_step_key, 0)
-    session_ip = session.get(session_ip_key, '')
-    current_ip = get_client_ip()
-    
-    if session_ip != current_ip:
-        return redirect(f'/l/{short_code}')
-    
-    if step != current_session_step + 1:
+    client_ip = get_client_ip()
+    outcome = advance_redirect(session, short_code, step, client_ip, redirect_clock())
+    if outcome == 'restart':
         return redirect(f'/l/{short_code}')
-    
-    start_time = session.get(session_time_key, 0)
-    if time.time() - start_time < (current_session_step * 15):
+    if outcome == 'too_fast':
         return "Çok hızlı! Biraz bekleyin.", 400
     
-    session[session_step_key] = step
-    
-    if step == 2:
-        client_ip = get_client_ip()
-        if not LinkVisit.has_visited_today(short_code, client_ip):
-            LinkVisit(
-                link_code=short_code,
-                ip_address=client_ip,
-                user_agent=request.headers.get('User-Agent', ''),
-                referrer=request.headers.get('Referer', ''),
-                step=2
-            )
-        return render_template_string(REDIRECT_TEMPLATE, short_code=short_code, step=2)
-    elif step == 3:
-        client_ip = get_client_ip()
-        if not LinkVisit.has_visited_today(short_code, client_ip):
-            LinkVisit(
-                link_code=short_code,
-                ip_address=client_ip,
-                user_agent=request.headers.get('User-Agent', ''),
-                referrer=request.headers.get('Referer', ''),
-                step=3
-            )
-        return render_template_string(REDIRECT_TEMPLATE, short_code=short_code, step=3)
+    user_agent = request.headers.get('User-Agent', '')
+    referrer = request.headers.get('Referer', '')
+    
+    if step in (2, 3):
+        record_visit(short_code, client_ip, user_agent, referrer, step)
+        return render_step_page(short_code, step)
     elif step == 4:
-        client_ip = get_client_ip()
-        if not LinkVisit.has_visited_today(short_code, client_ip):
-            LinkVisit(
-                link_code=short_code,
-                ip_address=client_ip,
-                user_agent=request.headers.get('User-Agent', ''),
-                referrer=request.headers.get('Referer', ''),
-                step=4
-            )
+        if record_visit(short_code, client_ip, user_agent, referrer, 4):
             link.increment_click()
         
-        session.pop(session_step_key, None)
-        session.pop(session_time_key, None)
-        session.pop(session_ip_key, None)
+        finish_redirect(session, short_code)
         
         return redirect(link.original_url)
     
@@ -432,7 +3072,7 @@ def redirect_step(short_code, step):
 def admin_login_get():
     if session.get('admin_logged_in'):
         return redirect('/admin/panel')
-    return render_template_string(LOGIN_TEMPLATE)
+    return login_page.response()
 
 @app.route('/admin', methods=['POST'])
 def admin_login_post():
@@ -453,7 +3093,7 @@ def admin_panel():
     if not session.get('admin_logged_in'):
         return redirect('/admin')
     
-    return render_template_string(ADMIN_PANEL_TEMPLATE)
+    return admin_panel_page.response()
 
 @app.route('/admin/logout')
 def admin_logout():
@@ -466,7 +3106,15 @@ def api_get_links():
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Giriş gerekli'}), 401
     
-    links = Link.get_all()
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    limit, cursor, error = parse_page_args(default_limit=50 if paginated else None)
+    # Cursor (created_at, short_code) çiftidir
+    if not error and cursor and (len(cursor) != 2 or not all(isinstance(part, str) for part in cursor)):
+        error = 'Geçersiz cursor'
+    if error:
+        return jsonify({'error': error}), 400
+    
+    links, next_cursor = Link.get_page(limit, cursor)
     links_data = []
     
     for link in links:
@@ -479,16 +3127,21 @@ def api_get_links():
             'is_active': link.is_active
         })
     
-    return jsonify(links_data)
+    if not paginated:
+        return jsonify(links_data)
+    
+    return jsonify({
+        'links': links_data,
+        'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+    })
 
 @app.route('/admin/api/links/<short_code>', methods=['DELETE'])
 def api_delete_link(short_code):
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Giriş gerekli'}), 401
     
-    link = Link.get_by_code(short_code)
-    if link:
-        link.delete()
+    link = Link.load_by_code(short_code)
+    if link and link.delete():
         return jsonify({'success': True})
     else:
         return jsonify({'error': 'Link bulunamadı'}), 404
@@ -498,19 +3151,70 @@ def api_toggle_link(short_code):
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Giriş gerekli'}), 401
     
-    link = Link.get_by_code(short_code)
-    if link:
-        link.toggle_active()
+    link = Link.load_by_code(short_code)
+    if link and link.toggle_active():
         return jsonify({'success': True, 'is_active': link.is_active})
     else:
         return jsonify({'error': 'Link bulunamadı'}), 404
 
+@app.route('/admin/api/links/bulk', methods=['POST'])
+def api_bulk_links():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Giriş gerekli'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    if action not in ('activate', 'deactivate', 'delete'):
+        return jsonify({'error': 'Geçersiz işlem'}), 400
+    
+    codes = data.get('codes')
+    filters = data.get('filter')
+    not_found = []
+    if codes is not None:
+        if not isinstance(codes, list) or not all(isinstance(code, str) for code in codes):
+            return jsonify({'error': 'Kodlar metin listesi olmalı'}), 400
+        if len(codes) > BATCH_MAX_SIZE:
+            return jsonify({'error': f'En fazla {BATCH_MAX_SIZE} kod gönderilebilir'}), 400
+        links = []
+        for short_code in dict.fromkeys(codes):
+            link = Link.load_by_code(short_code)
+            if link:
+                links.append(link)
+            else:
+                not_found.append(short_code)
+    elif isinstance(filters, dict) and (filters.get('domain') or filters.get('created_before')):
+        if not isinstance(filters.get('domain') or '', str):
+            return jsonify({'error': 'Geçersiz alan adı'}), 400
+        domain = (filters.get('domain') or '').strip().lower() or None
+        created_before = filters.get('created_before')
+        if created_before:
+            try:
+                created_before = datetime.fromisoformat(created_before).isoformat()
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Geçersiz tarih'}), 400
+        links = Link.find(domain=domain, created_before=created_before)
+    else:
+        return jsonify({'error': 'Kod listesi veya filtre gerekli'}), 400
+    
+    if action == 'delete':
+        changed = Link.delete_many(links)
+    else:
+        changed = len(Link.set_active_many(links, action == 'activate'))
+    
+    return jsonify({
+        'success': True,
+        'action': action,
+        'matched': len(links),
+        'changed': changed,
+        'not_found': not_found
+    })
+
 @app.route('/admin/api/stats', methods=['GET'])
 def api_get_stats():
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Giriş gerekli'}), 401
     
-    stats = Storage.get_stats()
+    stats = counters.get_stats()
     return jsonify(stats)
 
 @app.route('/admin/api/links/<short_code>/visits', methods=['GET'])
@@ -518,11 +3222,211 @@ def api_get_link_visits(short_code):
     if not session.get('admin_logged_in'):
         return jsonify({'error': 'Giriş gerekli'}), 401
     
-    visits = LinkVisit.get_visits(short_code)
-    return jsonify(visits)
+    # Parametresiz ve NDJSON istenmemişse eski biçim (JSON dizisi) yine akış halinde döner
+    stream_args = ('from', 'to', 'step', 'limit', 'cursor')
+    if (not any(arg in request.args for arg in stream_args)
+            and 'application/x-ndjson' not in request.headers.get('Accept', '')):
+        visits = (visit for _, visit in Storage.iter_visits(short_code))
+        return Response(stream_json_array(visits), mimetype='application/json')
+    
+    limit, cursor, error = parse_page_args(max_limit=VISITS_STREAM_MAX_LIMIT)
+    if not error and cursor and not Storage.valid_visit_position(cursor):
+        error = 'Geçersiz cursor'
+    if error:
+        return jsonify({'error': error}), 400
+    
+    # from dahil, to hariç; yalnızca tarih verilirse (YYYY-MM-DD) to günü de dahil edilir
+    start = request.args.get('from') or None
+    end = request.args.get('to') or None
+    try:
+        if start:
+            datetime.fromisoformat(start)
+        if end:
+            if len(end) == 10:
+                end = (datetime.fromisoformat(end) + timedelta(days=1)).date().isoformat()
+            datetime.fromisoformat(end)
+    except ValueError:
+        return jsonify({'error': 'Geçersiz tarih'}), 400
+    
+    step = request.args.get('step')
+    if step is not None:
+        try:
+            step = int(step)
+        except ValueError:
+            return jsonify({'error': 'Geçersiz adım'}), 400
+    
+    def generate():
+        # Son satır, devamı varsa {"next_cursor": "..."} kaydıdır
+        emitted = 0
+        last_position = None
+        lines = []
+        for position, visit in Storage.iter_visits(short_code, start, end, cursor):
+            if step is not None and visit.get('step') != step:
+                continue
+            if limit is not None and emitted == limit:
+                lines.append(json.dumps({'next_cursor': encode_cursor(last_position)}) + '\n')
+                break
+            lines.append(json.dumps(visit, ensure_ascii=False) + '\n')
+            emitted += 1
+            last_position = position
+            if len(lines) >= STREAM_CHUNK_LINES:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+# Huni: 1. adımdan yönlendirmeye (4) dönüşüm; günlük özetlerden okunur, ham ziyaretler taranmaz
+@app.route('/admin/api/funnel', methods=['GET'])
+def api_get_funnel():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Giriş gerekli'}), 401
+    
+    today = datetime.now().date()
+    start = request.args.get('from') or (today - timedelta(days=29)).isoformat()
+    end = request.args.get('to') or today.isoformat()
+    try:
+        datetime.strptime(start, '%Y-%m-%d')
+        datetime.strptime(end, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': 'Geçersiz tarih (YYYY-MM-DD)'}), 400
+    
+    short_code = request.args.get('code')
+    funnel = counters.get_funnel(short_code or FUNNEL_TOTAL, start, end)
+    
+    totals = {step: 0 for step in range(1, 5)}
+    days = []
+    for day in sorted(funnel):
+        steps = {step: funnel[day].get(step, 0) for step in range(1, 5)}
+        for step, count in steps.items():
+            totals[step] += count
+        days.append({'day': day, 'steps': steps})
+    
+    def ratio(numerator, denominator):
+        return round(numerator / denominator, 4) if denominator else 0.0
+    
+    return jsonify({
+        'short_code': short_code,
+        'from': start,
+        'to': end,
+        'steps': totals,
+        'conversion': {
+            '1_2': ratio(totals[2], totals[1]),
+            '2_3': ratio(totals[3], totals[2]),
+            '3_4': ratio(totals[4], totals[3]),
+            '1_4': ratio(totals[4], totals[1])
+        },
+        'days': days
+    })
+
+@app.route('/admin/api/export', methods=['GET'])
+def api_export():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Giriş gerekli'}), 401
+    
+    kind = request.args.get('type', 'links')
+    fmt = request.args.get('format', 'csv')
+    if kind not in EXPORT_COLUMNS:
+        return jsonify({'error': 'Geçersiz tür'}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Geçersiz biçim'}), 400
+    limit, cursor, error = parse_page_args(max_limit=sys.maxsize)
+    if not error and cursor and not valid_export_cursor(kind, cursor):
+        error = 'Geçersiz cursor'
+    if error:
+        return jsonify({'error': error}), 400
+    
+    # Devam isteklerinde CSV başlığı tekrar yazılmaz; parçalar uç uca eklenebilir
+    chunks = (chunk for chunk, _ in iter_export_chunks(kind, fmt, cursor, limit, header=not cursor))
+    filename = f'linkgec-{kind}.{fmt}'
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    if request.args.get('gzip', '0').lower() in ('1', 'true', 'yes', 'on'):
+        chunks = gzip_stream(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    response = Response(chunks, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+@app.route('/admin/api/metrics', methods=['GET'])
+def api_get_metrics():
+    if not session.get('admin_logged_in'):
+        return jsonify({'error': 'Giriş gerekli'}), 401
+    
+    return jsonify({
+        'link_cache': link_cache.stats(),
+        'visit_index': visit_index.stats(),
+        'counters': counters.stats(),
+        'code_allocator': code_allocator.stats(),
+        'page_cache': page_cache.stats(),
+        'visit_queue': visit_queue.stats(),
+        'rate_limiter': rate_limiter.stats(),
+        'user_agents': ua_classifier.stats(),
+        'validate_cache': validate_cache.stats()
+    })
+
+# İstatistik mutabakatı: sayaçlar Storage taranarak süreç havuzunda yeniden hesaplanır
+def _reconcile_worker_init():
+    # fork ile devralınan SQLite bağlantısı paylaşılmaz; her süreç kendi bağlantısını açar
+    SqliteStorage._local = threading.local()
+
+def _reconcile_links(short_codes: List[str]) -> List[tuple]:
+    results = []
+    for short_code in short_codes:
+        link_data = Storage.load_link(short_code)
+        if link_data:
+            # Tıklama, 4. adım ziyareti kaydedildiğinde sayılır
+            clicks = sum(1 for _, visit in Storage.iter_visits(short_code) if visit.get('step') == 4)
+            results.append((short_code, bool(link_data.get('is_active', True)),
+                            link_data.get('visits_count'), Storage.count_visits(short_code),
+                            link_data.get('click_count', 0), clicks))
+    return results
+
+def _chunked(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def reconcile_stats(workers: int | None = None, chunk_size: int = 1000) -> Dict:
+    # Gerçek değerleri, visits_count'u ve click_count'u (4. adım ziyaretleri) kayıtlı değerden
+    # farklı olan linkleri döner. total_clicks link kayıtlarındaki click_count toplamıdır.
+    actual = {'total_links': 0, 'active_links': 0, 'total_clicks': 0, 'total_visits': 0}
+    link_drift = []
+    click_drift = []
+    chunks = _chunked(Storage.iter_link_codes(), chunk_size)
+    if workers == 1:
+        results = map(_reconcile_links, chunks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_reconcile_worker_init)
+        results = pool.imap_unordered(_reconcile_links, chunks)
+    try:
+        for chunk_results in results:
+            for short_code, is_active, stored_visits, visits, stored_clicks, clicks in chunk_results:
+                actual['total_links'] += 1
+                actual['active_links'] += is_active
+                actual['total_clicks'] += stored_clicks
+                actual['total_visits'] += visits
+                if stored_visits != visits:
+                    link_drift.append((short_code, stored_visits, visits))
+                if stored_clicks != clicks:
+                    click_drift.append((short_code, stored_clicks, clicks))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return {'actual': actual, 'link_drift': link_drift, 'click_drift': click_drift}
 
 # İlk kurulum
 def init_app():
+    Storage.migrate_visits()
+    
     if not Storage.get_admin_user():
         admin = Admin('admin', 'admin123')
         admin.save()
@@ -535,6 +3439,168 @@ def init_app():
         ]
         Storage.save_ads(ads)
 
+# CLI komutları
+@app.cli.command('migrate-visits')
+def migrate_visits_command():
+    """Eski visits.json / visits.jsonl dosyalarını günlük (veya aylık) bölümlere taşır."""
+    migrated = Storage.migrate_visits(force=True)
+    click.echo(f'{migrated} link için ziyaret kaydı taşındı.')
+
+@app.cli.command('import-json')
+def import_json_command():
+    """Mevcut data/ JSON ağacını SQLite veritabanına aktarır."""
+    result = SqliteStorage.import_json_tree()
+    click.echo(f"{result['links']} link ve {result['visits']} ziyaret {SQLITE_PATH} dosyasına aktarıldı.")
+
+@app.cli.command('compact-stats')
+def compact_stats_command():
+    """Worker istatistik shard'larını stats.json içine katlar (worker'lar durdurulmuşken)."""
+    removed = Storage.compact_stats()
+    click.echo(f'{removed} shard stats.json dosyasına katlandı.')
+
+@app.cli.command('shard-storage')
+def shard_storage_command():
+    """Düz yapıdaki links/, visits/, urls/ ve funnels/ kayıtlarını hash tabanlı alt klasörlere taşır."""
+    if not STORAGE_SHARD_DEPTH:
+        raise click.ClickException('STORAGE_SHARD_DEPTH=0 iken düz yapı kullanılır; taşınacak bir şey yok.')
+    Storage.migrate_visits()
+    result = JsonStorage.shard_storage()
+    click.echo(f"{result['links']} link, {result['urls']} URL indeksi, {result['funnels']} huni dosyası ve "
+               f"{result['visits']} ziyaret klasörü alt klasörlere taşındı.")
+
+@app.cli.command('rebuild-catalog')
+def rebuild_catalog_command():
+    """Link kataloğunu links/ klasöründen yeniden oluşturur."""
+    count = link_catalog.rebuild()
+    click.echo(f'Katalog {count} link ile yeniden oluşturuldu.')
+
+@app.cli.command('archive-visits')
+@click.option('--archive-after-days', type=int, default=VISIT_ARCHIVE_AFTER_DAYS, show_default=True,
+              help='Bu günden eski ziyaret bölümleri gzip arşive çevrilir (0: kapalı)')
+@click.option('--retention-days', type=int, default=VISIT_RETENTION_DAYS, show_default=True,
+              help='Bu günden eski ziyaretler silinir (0: sınırsız)')
+def archive_visits_command(archive_after_days, retention_days):
+    """Eski ziyaret bölümlerini arşivler ve saklama süresini aşanları siler."""
+    Storage.migrate_visits()
+    visit_queue.flush()
+    result = Storage.archive_visits(archive_after_days, retention_days)
+    click.echo(f'{result["archived"]} bölüm arşivlendi, {result["pruned"]} bölüm/kayıt silindi.')
+
+@app.cli.command('rebuild-url-index')
+def rebuild_url_index_command():
+    """Dedup modu için normalize URL -> kısa kod indeksini yeniden oluşturur."""
+    count = Storage.rebuild_url_index()
+    click.echo(f'URL indeksi {count} URL ile yeniden oluşturuldu.')
+
+@app.cli.command('rebuild-visit-counts')
+@click.option('--offline', is_flag=True, help='Tüm uygulama worker\'ları durdurulmuş')
+def rebuild_visit_counts_command(offline):
+    """Link kayıtlarındaki visits_count alanını ziyaret verisinden yeniden hesaplar."""
+    # Çalışan worker'ların yazılmamış ziyaretleri ve visits_count farkları sayımla çakışır
+    if not offline:
+        raise click.ClickException('Ziyaret sayıları yalnızca tüm worker\'lar durdurulmuşken yeniden hesaplanır; '
+                                   'durdurduktan sonra --offline ile çalıştırın.')
+    Storage.migrate_visits()
+    visit_queue.flush()
+    counters.flush()
+    with counters.flush_lock:
+        updated = Storage.rebuild_visit_counts()
+    click.echo(f'{updated} linkin ziyaret sayısı güncellendi.')
+
+@app.cli.command('export')
+@click.option('--type', 'kind', type=click.Choice(list(EXPORT_COLUMNS)), default='links', show_default=True)
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv', show_default=True)
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default='-',
+              help='Çıktı dosyası (varsayılan: standart çıktı)')
+@click.option('--gzip', 'compress', is_flag=True, help='Çıktıyı gzip ile sıkıştırır')
+@click.option('--cursor', default=None, help='Yarıda kalan dışa aktarmaya bu noktadan devam eder')
+def export_command(kind, fmt, output, compress, cursor):
+    """Linkleri veya ziyaretleri CSV / NDJSON olarak dışa aktarır."""
+    if cursor:
+        cursor = decode_cursor(cursor)
+        if cursor is None or not valid_export_cursor(kind, cursor):
+            raise click.BadParameter('Geçersiz cursor', param_hint='--cursor')
+    Storage.migrate_visits()
+    visit_queue.flush()
+    counters.flush()
+    # Devam ederken dosyanın sonuna eklenir; gzip üyeleri uç uca eklenince geçerli kalır
+    stream = click.open_file(output, 'ab' if cursor else 'wb')
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    written_cursor = cursor
+    try:
+        for chunk, chunk_cursor in iter_export_chunks(kind, fmt, cursor, header=not cursor):
+            data = chunk.encode('utf-8')
+            stream.write(compressor.compress(data) if compressor else data)
+            written_cursor = chunk_cursor
+    except KeyboardInterrupt:
+        if written_cursor:
+            click.echo(f'Dışa aktarma yarıda kaldı; devam etmek için: --cursor {encode_cursor(written_cursor)}',
+                       err=True)
+        raise click.Abort()
+    finally:
+        if compressor:
+            stream.write(compressor.flush())
+        stream.close()
+
+@app.cli.command('reconcile-stats')
+@click.option('--workers', type=int, default=None, help='Süreç sayısı (varsayılan: CPU sayısı)')
+@click.option('--chunk-size', type=int, default=1000, show_default=True, help='Bir görevde taranan link sayısı')
+@click.option('--dry-run', is_flag=True, help='Yalnızca sapmaları raporlar, düzeltme yazmaz')
+@click.option('--offline', is_flag=True, help='Tüm uygulama worker\'ları durdurulmuş; düzeltmeler yazılır')
+@click.option('--fix-clicks', is_flag=True,
+              help='click_count\'u 4. adım ziyaretlerine, total_clicks\'i link toplamına eşitler')
+def reconcile_stats_command(workers, chunk_size, dry_run, offline, fix_clicks):
+    """Genel istatistikleri ve link visits_count alanlarını Storage'ı tarayarak yeniden hesaplar."""
+    # Çalışan worker'ların henüz yazılmamış sayaçları sapma gibi görünür; düzeltme yazılırsa
+    # worker'lar flush ettiğinde aynı artışlar ikinci kez eklenir
+    if not dry_run and not offline:
+        raise click.ClickException('Düzeltme yazmak için tüm worker\'lar durdurulmalı ve --offline verilmeli '
+                                   '(yalnızca rapor için --dry-run).')
+    Storage.migrate_visits()
+    visit_queue.flush()
+    counters.flush()
+    with counters.flush_lock:
+        started = time.perf_counter()
+        result = reconcile_stats(workers, chunk_size)
+        current = Storage.get_stats()
+        actual = result['actual']
+        drift = {key: value - current.get(key, 0) for key, value in actual.items()}
+        click.echo(f"{actual['total_links']} link {time.perf_counter() - started:.1f} sn'de tarandı.")
+        click.echo(f"{'alan':<14} {'kayıtlı':>12} {'gerçek':>12} {'sapma':>10}")
+        for key, value in actual.items():
+            click.echo(f'{key:<14} {current.get(key, 0):>12} {value:>12} {drift[key]:>+10}')
+        link_drift = result['link_drift']
+        click.echo(f'visits_count sapması olan link: {len(link_drift)}')
+        for short_code, stored_visits, visits in link_drift[:20]:
+            click.echo(f'  {short_code}: {stored_visits} -> {visits}')
+        click_drift = result['click_drift']
+        click.echo(f'click_count sapması olan link (4. adım ziyaretlerine göre): {len(click_drift)}')
+        for short_code, stored_clicks, clicks in click_drift[:20]:
+            click.echo(f'  {short_code}: {stored_clicks} -> {clicks}')
+        # Tıklamalar varsayılan olarak düzeltilmez: silinen linklerin tıklamaları total_clicks'te kalır,
+        # saklama süresiyle silinen veya kuyrukta atlanan ziyaretler click_count'ta sayılmış olabilir
+        if not fix_clicks and (drift['total_clicks'] or click_drift):
+            click.echo('Tıklamalar düzeltilmez: silinen linklerin tıklamaları total_clicks\'te kalır; '
+                       'VISIT_RETENTION_DAYS ile silinen veya kuyrukta atlanan ziyaretler click_count\'ta '
+                       'sayılmış olabilir. Yine de eşitlemek için --fix-clicks kullanın.')
+        if dry_run:
+            return
+        # Fark artış olarak yazılır; mevcut shard'lar geçerli kalır
+        if fix_clicks:
+            drift['total_clicks'] += sum(clicks - stored_clicks for _, stored_clicks, clicks in click_drift)
+        else:
+            drift['total_clicks'] = 0
+            click_drift = []
+        deltas = {key: delta for key, delta in drift.items() if delta}
+        if deltas:
+            Storage.add_stats(deltas)
+        for short_code, stored_visits, visits in link_drift:
+            Storage.add_link_counts(short_code, {'visits_count': visits - (stored_visits or 0)})
+        for short_code, stored_clicks, clicks in click_drift:
+            Storage.add_link_counts(short_code, {'click_count': clicks - stored_clicks})
+        link_cache.clear()
+    click.echo('Sapmalar düzeltildi.' if deltas or link_drift or click_drift else 'Düzeltilecek sapma yok.')
+
 # HTML Templates - Ana sayfa
 INDEX_TEMPLATE = '''
 <!DOCTYPE html>
@@ -1186,6 +4252,17 @@ ADMIN_PANEL_TEMPLATE = '''
             background: #dc3545;
             color: white;
         }
+        .bulk-bar {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 8px;
+            align-items: center;
+        }
+        .bulk-filter input {
+            padding: 6px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }
         .status-active { color: #28a745; font-weight: 600; }
         .status-inactive { color: #dc3545; font-weight: 600; }
     </style>
@@ -1220,9 +4297,20 @@ ADMIN_PANEL_TEMPLATE = '''
 
         <div class="section">
             <div class="section-title">Link Yönetimi</div>
+            <div class="bulk-bar">
+                <button class="btn btn-success" onclick="bulkSelected('activate')">Seçilenleri Aktifleştir</button>
+                <button class="btn btn-warning" onclick="bulkSelected('deactivate')">Seçilenleri Pasifleştir</button>
+                <button class="btn btn-danger" onclick="bulkSelected('delete')">Seçilenleri Sil</button>
+                <span class="bulk-filter">
+                    <input type="text" id="filterDomain" placeholder="alan adı (ör. spam.com)">
+                    <input type="date" id="filterCreatedBefore" title="Bu tarihten önce oluşturulanlar">
+                    <button class="btn btn-danger" onclick="bulkFilterDelete()">Filtreye Uyanları Sil</button>
+                </span>
+            </div>
             <table class="links-table">
                 <thead>
                     <tr>
+                        <th><input type="checkbox" id="selectAll" onchange="toggleSelectAll(this.checked)"></th>
                         <th>Kısa Link</th>
                         <th>Hedef URL</th>
                         <th>Tıklama</th>
@@ -1236,6 +4324,11 @@ ADMIN_PANEL_TEMPLATE = '''
                     <!-- Links will be loaded here -->
                 </tbody>
             </table>
+            <div style="text-align: center; margin-top: 15px;">
+                <button class="btn btn-primary" id="loadMoreBtn" style="display: none;" onclick="loadLinks(false)">
+                    Daha Fazla Yükle
+                </button>
+            </div>
         </div>
     </div>
 
@@ -1259,13 +4352,24 @@ ADMIN_PANEL_TEMPLATE = '''
             }
         }
 
-        async function loadLinks() {
+        let nextCursor = null;
+
+        async function loadLinks(reset = true) {
             try {
-                const response = await fetch('/admin/api/links');
-                const links = await response.json();
+                let url = '/admin/api/links?limit=50';
+                if (!reset && nextCursor) {
+                    url += `&cursor=${encodeURIComponent(nextCursor)}`;
+                }
+                const response = await fetch(url);
+                const page = await response.json();
+                const links = page.links;
+                nextCursor = page.next_cursor;
+                document.getElementById('loadMoreBtn').style.display = nextCursor ? 'inline-block' : 'none';
                 
                 const tbody = document.getElementById('linksTableBody');
-                tbody.innerHTML = '';
+                if (reset) {
+                    tbody.innerHTML = '';
+                }
                 
                 links.forEach(link => {
                     const row = document.createElement('tr');
@@ -1273,6 +4377,7 @@ ADMIN_PANEL_TEMPLATE = '''
                     const createdDate = new Date(link.created_at).toLocaleDateString('tr-TR');
                     
                     row.innerHTML = `
+                        <td><input type="checkbox" class="link-select" value="${link.short_code}"></td>
                         <td>
                             <a href="${shortUrl}" target="_blank" style="color: #667eea; text-decoration: none;">
                                 ${shortUrl}
@@ -1342,11 +4447,75 @@ ADMIN_PANEL_TEMPLATE = '''
                 console.error('Link silinemedi:', error);
             }
         }
+
+        function toggleSelectAll(checked) {
+            document.querySelectorAll('.link-select').forEach(box => box.checked = checked);
+        }
+
+        async function bulkAction(payload) {
+            try {
+                const response = await fetch('/admin/api/links/bulk', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(payload)
+                });
+                const result = await response.json();
+                if (!response.ok) {
+                    alert(result.error);
+                    return;
+                }
+                document.getElementById('selectAll').checked = false;
+                await loadLinks();
+                await loadStats();
+                alert(`${result.matched} link bulundu, ${result.changed} link güncellendi.`);
+            } catch (error) {
+                console.error('Toplu işlem başarısız:', error);
+            }
+        }
+
+        async function bulkSelected(action) {
+            const codes = Array.from(document.querySelectorAll('.link-select:checked')).map(box => box.value);
+            if (codes.length === 0) {
+                alert('Önce link seçin.');
+                return;
+            }
+            if (action === 'delete' && !confirm(`${codes.length} linki silmek istediğinizden emin misiniz?`)) {
+                return;
+            }
+            await bulkAction({ action: action, codes: codes });
+        }
+
+        async function bulkFilterDelete() {
+            const filter = {};
+            const domain = document.getElementById('filterDomain').value.trim();
+            const createdBefore = document.getElementById('filterCreatedBefore').value;
+            if (domain) filter.domain = domain;
+            if (createdBefore) filter.created_before = createdBefore;
+            if (!domain && !createdBefore) {
+                alert('Alan adı veya tarih girin.');
+                return;
+            }
+            if (!confirm('Filtreye uyan tüm linkler silinecek. Emin misiniz?')) {
+                return;
+            }
+            await bulkAction({ action: 'delete', filter: filter });
+        }
     </script>
 </body>
 </html>
 '''
 
+# Şablonlar açılışta bir kez derlenir
+index_template = app.jinja_env.from_string(INDEX_TEMPLATE)
+redirect_template = app.jinja_env.from_string(REDIRECT_TEMPLATE)
+login_template = app.jinja_env.from_string(LOGIN_TEMPLATE)
+admin_panel_template = app.jinja_env.from_string(ADMIN_PANEL_TEMPLATE)
+page_cache = LRUCache(PAGE_CACHE_SIZE, ttl=None)
+
+index_page = StaticPage(index_template.render().encode('utf-8'), 'public, no-cache')
+login_page = StaticPage(login_template.render().encode('utf-8'), 'private, no-cache')
+admin_panel_page = StaticPage(admin_panel_template.render().encode('utf-8'), 'private, no-cache')
+
 if __name__ == '__main__':
     init_app()
     app.run(host='0.0.0.0', port=5001, debug=True)
@@ -0,0 +1,187 @@
+"""LinkGeç ASGI giriş noktası.
+
+/l/<short_code> ve /l/<short_code>/step/<step> yolları async handler'larla
+sunulur; diğer tüm yollar WSGI köprüsü üzerinden Flask uygulamasına aktarılır.
+Oturum çerezi Flask'ın imzalı çereziyle aynıdır, iki yol birbirinin
+oturumunu okuyabilir.
+
+Çalıştırma:
+    pip install "Flask[async]" uvicorn
+    uvicorn asgi:application --workers 4
+"""
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import Headers
+from werkzeug.http import dump_cookie
+
+# redirect_clock modül üzerinden okunur; ölçüm betikleri saati değiştirebilir
+import app as app_module
+from app import (app, Link, SqliteRateLimiter, link_cache, rate_limiter, client_ip_from,
+                 start_redirect, advance_redirect, finish_redirect, record_visit, step_page_body,
+                 RATE_LIMIT_MESSAGE)
+
+STORAGE_THREADS = int(os.environ.get('ASGI_STORAGE_THREADS', 32))
+
+LINK_PATH = re.compile(r'^/l/([^/]+)$')
+STEP_PATH = re.compile(r'^/l/([^/]+)/step/(\d+)$')
+
+
+# Async storage: önbellekte olmayan okumalar ve disk yazmaları thread havuzunda çalışır
+class AsyncStorage:
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='storage')
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def get_link(self, short_code: str):
+        cached = link_cache.get(short_code)
+        if cached is not None and 'visits_count' in cached:
+            return Link._from_data(dict(cached))
+        # visits_count'u olmayan eski kayıtta Link._from_data ziyaretleri diskten sayar;
+        # okuma ve nesne oluşturma birlikte thread havuzunda yapılır
+        return await self.run(Link.get_by_code, short_code)
+
+    async def rate_limit(self, client_ip: str) -> float:
+        # Bellek içi limit doğrudan, SQLite tabanlı limit thread havuzunda kontrol edilir
+        if isinstance(rate_limiter, SqliteRateLimiter):
+            return await self.run(rate_limiter.hit, 'redirect', client_ip)
+        return rate_limiter.hit('redirect', client_ip)
+
+    async def record_visit(self, short_code, client_ip, user_agent, referrer, step):
+        return await self.run(record_visit, short_code, client_ip, user_agent, referrer, step)
+
+    async def increment_click(self, link):
+        await self.run(link.increment_click)
+
+
+storage = AsyncStorage(STORAGE_THREADS)
+flask_application = WsgiToAsgi(app)
+
+
+# Oturum: Flask'ın SecureCookieSessionInterface ile aynı imzalı çerez
+def load_session(headers: Headers) -> dict:
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookie = SimpleCookie()
+    try:
+        cookie.load(headers.get('Cookie', ''))
+    except Exception:
+        return {}
+    morsel = cookie.get(app.config['SESSION_COOKIE_NAME'])
+    if serializer is None or morsel is None:
+        return {}
+    try:
+        max_age = int(app.permanent_session_lifetime.total_seconds())
+        return dict(serializer.loads(morsel.value, max_age=max_age))
+    except Exception:
+        return {}
+
+
+def session_cookie_header(state: dict) -> tuple:
+    name = app.config['SESSION_COOKIE_NAME']
+    options = {
+        'path': app.config['SESSION_COOKIE_PATH'] or app.config['APPLICATION_ROOT'],
+        'domain': app.config['SESSION_COOKIE_DOMAIN'],
+        'secure': app.config['SESSION_COOKIE_SECURE'],
+        'httponly': app.config['SESSION_COOKIE_HTTPONLY'],
+        'samesite': app.config['SESSION_COOKIE_SAMESITE']
+    }
+    if not state:
+        value = dump_cookie(name, '', max_age=0, expires=0, **options)
+    else:
+        serializer = app.session_interface.get_signing_serializer(app)
+        value = dump_cookie(name, serializer.dumps(state), **options)
+    return (b'set-cookie', value.encode('latin-1'))
+
+
+async def send_response(send, status: int, body: bytes, content_type: str = 'text/html; charset=utf-8',
+                        headers: list | None = None):
+    response_headers = [
+        (b'content-type', content_type.encode('latin-1')),
+        (b'content-length', str(len(body)).encode('latin-1')),
+        (b'vary', b'Cookie')
+    ]
+    response_headers.extend(headers or [])
+    await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_redirect(send, location: str, headers: list | None = None):
+    await send_response(send, 302, b'', headers=[(b'location', location.encode('utf-8'))] + (headers or []))
+
+
+async def send_rate_limited(send, retry_after: float):
+    await send_response(send, 429, RATE_LIMIT_MESSAGE.encode('utf-8'),
+                        headers=[(b'retry-after', str(int(retry_after) + 1).encode('latin-1'))])
+
+
+async def redirect_link(scope, send, headers, short_code):
+    client_ip = client_ip_from(headers, (scope.get('client') or [None])[0])
+    retry_after = await storage.rate_limit(client_ip)
+    if retry_after:
+        return await send_rate_limited(send, retry_after)
+
+    link = await storage.get_link(short_code)
+    if not link or not link.is_active:
+        return await send_response(send, 404, 'Link bulunamadı'.encode('utf-8'))
+
+    state = load_session(headers)
+    start_redirect(state, short_code, client_ip, app_module.redirect_clock())
+
+    await storage.record_visit(short_code, client_ip, headers.get('User-Agent', ''),
+                               headers.get('Referer', ''), 1)
+
+    await send_response(send, 200, step_page_body(short_code, 1), headers=[session_cookie_header(state)])
+
+
+async def redirect_step(scope, send, headers, short_code, step):
+    client_ip = client_ip_from(headers, (scope.get('client') or [None])[0])
+    retry_after = await storage.rate_limit(client_ip)
+    if retry_after:
+        return await send_rate_limited(send, retry_after)
+
+    link = await storage.get_link(short_code)
+    if not link or not link.is_active:
+        return await send_response(send, 404, 'Link bulunamadı'.encode('utf-8'))
+
+    state = load_session(headers)
+    outcome = advance_redirect(state, short_code, step, client_ip, app_module.redirect_clock())
+    # Oturum yalnızca adım ilerlediğinde değişir; diğer durumlarda çerez gönderilmez
+    if outcome == 'restart':
+        return await send_redirect(send, f'/l/{short_code}')
+    if outcome == 'too_fast':
+        return await send_response(send, 400, 'Çok hızlı! Biraz bekleyin.'.encode('utf-8'))
+
+    user_agent = headers.get('User-Agent', '')
+    referrer = headers.get('Referer', '')
+
+    if step in (2, 3):
+        await storage.record_visit(short_code, client_ip, user_agent, referrer, step)
+        return await send_response(send, 200, step_page_body(short_code, step),
+                                   headers=[session_cookie_header(state)])
+    elif step == 4:
+        if await storage.record_visit(short_code, client_ip, user_agent, referrer, 4):
+            await storage.increment_click(link)
+        finish_redirect(state, short_code)
+        return await send_redirect(send, link.original_url, [session_cookie_header(state)])
+
+    await send_response(send, 400, 'Geçersiz adım'.encode('utf-8'), headers=[session_cookie_header(state)])
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['method'] == 'GET':
+        path = scope['path']
+        match = LINK_PATH.match(path) or STEP_PATH.match(path)
+        if match:
+            headers = Headers([(key.decode('latin-1'), value.decode('latin-1'))
+                               for key, value in scope['headers']])
+            if match.re is LINK_PATH:
+                return await redirect_link(scope, send, headers, match.group(1))
+            return await redirect_step(scope, send, headers, match.group(1), int(match.group(2)))
+    return await flask_application(scope, receive, send)
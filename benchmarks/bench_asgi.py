@@ -0,0 +1,156 @@
+"""Yönlendirme akışı: WSGI (thread'li werkzeug) ile ASGI (uvicorn) sunucusu karşılaştırması.
+
+Kullanım:
+    pip install uvicorn asgiref
+    python benchmarks/bench_asgi.py --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WSGI_SERVER = (
+    'import sys; sys.path.insert(0, {root!r}); '
+    'from werkzeug.serving import run_simple, WSGIRequestHandler; from app import app; '
+    'WSGIRequestHandler.protocol_version = "HTTP/1.1"; '
+    'run_simple("127.0.0.1", {port}, app, threaded=True)'
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'sunucu {port} portunda açılmadı')
+
+
+async def fetch(reader, writer, path: str, cookie: str) -> tuple:
+    request = f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nUser-Agent: bench\r\n'
+    if cookie:
+        request += f'Cookie: session={cookie}\r\n'
+    writer.write((request + '\r\n').encode('latin-1'))
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    keep_alive = True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+        elif name.lower() == 'connection' and value.strip().lower() == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), keep_alive
+
+
+async def run_load(port: int, path: str, cookie: str, total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def client():
+        nonlocal remaining, errors
+        connection = None
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                # Sunucu bağlantıyı kapatırsa yeniden bağlanma süresi de ölçüme dahildir
+                if connection is None:
+                    connection = await asyncio.open_connection('127.0.0.1', port)
+                status, keep_alive = await fetch(*connection, path, cookie)
+            except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+                errors += 1
+                keep_alive = False
+            else:
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+            if not keep_alive and connection is not None:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def report(label: str, elapsed: float, latencies, errors: int):
+    print(f'{label:<28} {len(latencies) / elapsed:>9,.0f} istek/sn  '
+          f'p50={percentile(latencies, 50):6.1f}ms  p95={percentile(latencies, 95):6.1f}ms  '
+          f'p99={percentile(latencies, 99):6.1f}ms  hata={errors}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000, help='her senaryo için istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=200, help='eşzamanlı bağlantı sayısı')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='linkgec-bench-'))
+    os.environ['STORAGE_BACKEND'] = args.backend
+    # Tüm istekler tek IP'den gelir; rate limit ölçümü bozmasın
+    os.environ['RATE_LIMIT_REDIRECT'] = ''
+    sys.path.insert(0, ROOT)
+    import app as app_module
+
+    short_code = app_module.Link('https://example.com/bench').short_code
+    # Adım 2 için imzalı oturum: başlangıç zamanı geçmişte, 15 sn kontrolü geçilir
+    serializer = app_module.app.session_interface.get_signing_serializer(app_module.app)
+    cookie = serializer.dumps({
+        f'link_{short_code}_step': 1,
+        f'link_{short_code}_start_time': time.time() - 3600,
+        f'link_{short_code}_ip': '127.0.0.1'
+    })
+    print(f'backend={args.backend} istek={args.requests} eşzamanlılık={args.concurrency} dizin={os.getcwd()}')
+
+    servers = {
+        'wsgi': lambda port: [sys.executable, '-c', WSGI_SERVER.format(root=ROOT, port=port)],
+        'asgi': lambda port: [sys.executable, '-m', 'uvicorn', 'asgi:application', '--app-dir', ROOT,
+                              '--port', str(port), '--log-level', 'warning', '--no-access-log'],
+    }
+    for name, command in servers.items():
+        port = free_port()
+        process = subprocess.Popen(command(port), stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            for label, path, session_cookie in (('/l/<code>', f'/l/{short_code}', ''),
+                                                ('/l/<code>/step/2', f'/l/{short_code}/step/2', cookie)):
+                asyncio.run(run_load(port, path, session_cookie, min(200, args.requests), args.concurrency))
+                report(f'{name} {label}', *asyncio.run(
+                    run_load(port, path, session_cookie, args.requests, args.concurrency)))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""Uçtan uca gecikme ölçümü: kısaltma, yönlendirme akışı (/l/<kod> → /step/2..4) ve admin API'leri.
+
+Flask test istemcisi kullanılır; 15 sn adım kontrolü sahte saat ile ilerletilir.
+Sonuçlar JSON olarak kaydedilir, --compare ile önceki bir çalıştırmayla karşılaştırılır.
+
+Kullanım:
+    python benchmarks/bench_e2e.py --links 1000 --visits 20 --requests 2000 --backend json
+    python benchmarks/bench_e2e.py --backend sqlite --output sqlite.json --compare json.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+
+class FakeClock:
+    # Yönlendirme adımları arasında gerçek bekleme yerine saat ileri alınır
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.elapsed = {}
+
+    def add(self, scenario: str, latency: float, ok: bool = True):
+        self.latencies.setdefault(scenario, []).append(latency)
+        self.elapsed[scenario] = self.elapsed.get(scenario, 0.0) + latency
+        if not ok:
+            self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+    def call(self, scenario: str, func, expected: int):
+        start = time.perf_counter()
+        response = func()
+        self.add(scenario, time.perf_counter() - start, response.status_code == expected)
+        return response
+
+    def results(self) -> dict:
+        results = {}
+        for scenario, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            results[scenario] = {
+                'requests': len(latencies),
+                'errors': self.errors.get(scenario, 0),
+                'throughput': len(latencies) / self.elapsed[scenario] if self.elapsed[scenario] else 0.0,
+                'mean_ms': sum(latencies) / len(latencies) * 1000,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99)
+            }
+        return results
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def generate_dataset(app_module, links: int, visits: int) -> list:
+    # N link ve link başına M ziyaret (son 30 güne dağılmış) oluşturulur
+    codes = []
+    for start in range(0, links, 1000):
+        urls = [f'https://example.com/dataset/{i}' for i in range(start, min(start + 1000, links))]
+        codes.extend(link.short_code for link in app_module.Link.new_batch(urls))
+    now = datetime.now()
+    for code in codes:
+        app_module.Storage.save_visits(code, [{
+            'ip_address': f'10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}',
+            'user_agent': BROWSER_UA,
+            'referrer': '',
+            'step': random.randint(1, 4),
+            'visit_time': (now - timedelta(seconds=random.randint(0, 30 * 86400))).isoformat()
+        } for _ in range(visits)])
+    app_module.counters.incr('total_links', len(codes))
+    app_module.counters.incr('active_links', len(codes))
+    app_module.counters.incr('total_visits', len(codes) * visits)
+    app_module.counters.flush()
+    return codes
+
+
+def run_shorten(app_module, recorder: Recorder, requests: int):
+    client = app_module.app.test_client()
+    for i in range(requests):
+        recorder.call('shorten', lambda: client.post(
+            '/api/shorten', json={'url': f'https://example.com/bench/{i}'}, headers={'User-Agent': BROWSER_UA}
+        ), 201)
+
+
+def run_redirect_flow(app_module, recorder: Recorder, clock: FakeClock, codes: list, flows: int):
+    # Her akış yeni bir oturum ve IP ile başlar; adımlar arasında saat 15 sn ileri alınır
+    for i in range(flows):
+        client = app_module.app.test_client()
+        code = random.choice(codes)
+        environ = {'REMOTE_ADDR': f'172.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}'}
+        headers = {'User-Agent': BROWSER_UA}
+        start = time.perf_counter()
+        recorder.call('redirect_step1', lambda: client.get(
+            f'/l/{code}', headers=headers, environ_base=environ), 200)
+        for step in (2, 3, 4):
+            clock.advance(15)
+            recorder.call(f'redirect_step{step}', lambda: client.get(
+                f'/l/{code}/step/{step}', headers=headers, environ_base=environ), 302 if step == 4 else 200)
+        recorder.add('redirect_flow', time.perf_counter() - start)
+
+
+def run_admin(app_module, recorder: Recorder, codes: list, requests: int):
+    client = app_module.app.test_client()
+    response = client.post('/admin', json={'username': 'admin', 'password': 'admin123'})
+    if response.status_code != 200:
+        raise RuntimeError('admin girişi başarısız')
+    today = datetime.now().date()
+    month_ago = (today - timedelta(days=29)).isoformat()
+    for _ in range(requests):
+        code = random.choice(codes)
+        recorder.call('admin_links_page', lambda: client.get('/admin/api/links?limit=50'), 200)
+        recorder.call('admin_stats', lambda: client.get('/admin/api/stats'), 200)
+        recorder.call('admin_visits', lambda: client.get(
+            f'/admin/api/links/{code}/visits?from={month_ago}&limit=100'), 200)
+        recorder.call('admin_funnel', lambda: client.get(f'/admin/api/funnel?code={code}'), 200)
+
+
+def report(results: dict, baseline: dict | None = None):
+    for scenario, result in results.items():
+        line = (f'{scenario:<20} {result["throughput"]:>9,.0f} istek/sn  p50={result["p50_ms"]:7.2f}ms  '
+                f'p95={result["p95_ms"]:7.2f}ms  p99={result["p99_ms"]:7.2f}ms  hata={result["errors"]}')
+        previous = (baseline or {}).get(scenario)
+        if previous and previous['throughput'] and previous['p95_ms']:
+            line += (f'  [istek/sn {result["throughput"] / previous["throughput"] - 1:+.0%}, '
+                     f'p95 {result["p95_ms"] / previous["p95_ms"] - 1:+.0%}]')
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--links', type=int, default=1000, help='önceden oluşturulacak link sayısı')
+    parser.add_argument('--visits', type=int, default=20, help='link başına önceden oluşturulacak ziyaret sayısı')
+    parser.add_argument('--requests', type=int, default=2000, help='kısaltma isteği ve yönlendirme akışı sayısı')
+    parser.add_argument('--admin-requests', type=int, default=200, help='her admin API için istek sayısı')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='sonuç JSON dosyası (varsayılan: bench_e2e-<backend>-<zaman>.json)')
+    parser.add_argument('--compare', help='karşılaştırılacak önceki sonuç JSON dosyası')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output or f'bench_e2e-{args.backend}-{datetime.now():%Y%m%d-%H%M%S}.json')
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    random.seed(args.seed)
+    os.chdir(tempfile.mkdtemp(prefix='linkgec-bench-'))
+    os.environ['STORAGE_BACKEND'] = args.backend
+    # Tüm istekler tek süreçten gelir; rate limit ölçümü bozmasın
+    for name in ('RATE_LIMIT_SHORTEN', 'RATE_LIMIT_BATCH', 'RATE_LIMIT_REDIRECT'):
+        os.environ[name] = ''
+    sys.path.insert(0, ROOT)
+    import app as app_module
+
+    app_module.init_app()
+    clock = FakeClock()
+    app_module.redirect_clock = clock
+
+    start = time.perf_counter()
+    codes = generate_dataset(app_module, args.links, args.visits)
+    print(f'backend={args.backend} link={args.links} ziyaret/link={args.visits} istek={args.requests} '
+          f'veri seti {time.perf_counter() - start:.1f} sn dizin={os.getcwd()}')
+
+    recorder = Recorder()
+    run_shorten(app_module, recorder, args.requests)
+    run_redirect_flow(app_module, recorder, clock, codes, args.requests)
+    app_module.visit_queue.flush()
+    app_module.counters.flush()
+    run_admin(app_module, recorder, codes, args.admin_requests)
+
+    results = recorder.results()
+    report(results, baseline)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'args': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+            },
+            'results': results
+        }, f, indent=2)
+    print(f'sonuçlar: {output}')
+
+
+if __name__ == '__main__':
+    main()
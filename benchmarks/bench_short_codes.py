@@ -0,0 +1,87 @@
+"""Kısa kod üretimi karşılaştırması: eski rastgele+disk kontrolü ile sayaç tabanlı üretici.
+
+Kullanım:
+    python benchmarks/bench_short_codes.py --links 10000 --count 5000 --backend json
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_generate(app_module):
+    # Eski Link._generate_short_code davranışı: her aday için storage'a bakılır
+    probes = 0
+    while True:
+        code = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+        probes += 1
+        if not app_module.Storage.get_link(code):
+            return code, probes
+
+
+def make_link_data(short_code, created_at):
+    return {
+        'short_code': short_code,
+        'original_url': f'https://example.com/{short_code}',
+        'click_count': 0,
+        'visits_count': 0,
+        'created_at': created_at,
+        'is_active': True
+    }
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    extra = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<40} {count / elapsed:>12,.0f} kod/sn  ({elapsed:.3f} sn){extra or ""}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--links', type=int, default=10000, help='önceden oluşturulacak link sayısı')
+    parser.add_argument('--count', type=int, default=5000, help='her yöntem için üretilecek kod sayısı')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='linkgec-bench-'))
+    os.environ['STORAGE_BACKEND'] = args.backend
+    sys.path.insert(0, ROOT)
+    import app as app_module
+
+    created_at = '2025-01-01T00:00:00'
+    for _ in range(args.links):
+        app_module.Storage.create_link(make_link_data(app_module.code_allocator.allocate(), created_at))
+    print(f'backend={args.backend} mevcut_link={args.links} adet={args.count} dizin={os.getcwd()}')
+
+    def legacy_codes_only():
+        probes = sum(legacy_generate(app_module)[1] for _ in range(args.count))
+        return f'  disk kontrolü={probes}'
+
+    def allocator_codes_only():
+        for _ in range(args.count):
+            app_module.code_allocator.allocate()
+
+    def legacy_create():
+        for _ in range(args.count):
+            code, _ = legacy_generate(app_module)
+            app_module.Storage.save_link(make_link_data(code, created_at))
+
+    def allocator_create():
+        for _ in range(args.count):
+            while not app_module.Storage.create_link(make_link_data(app_module.code_allocator.allocate(), created_at)):
+                pass
+
+    timed('eski: random + get_link', args.count, legacy_codes_only)
+    timed('yeni: ShortCodeAllocator.allocate', args.count, allocator_codes_only)
+    timed('eski: random + get_link + save_link', args.count, legacy_create)
+    timed('yeni: allocate + create_link', args.count, allocator_create)
+
+
+if __name__ == '__main__':
+    main()